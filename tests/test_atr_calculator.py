@@ -0,0 +1,53 @@
+"""Tests for the ATR calculator."""
+
+import os
+import sys
+
+import numpy as np
+
+
+# Allow imports from the backend directory
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "whispr", "backend"))
+
+from atr_calculator import ATRCalculator, SPXPriceSimulator  # noqa: E402
+
+
+def _loaded_calculator(timeframes, bars=30, seed=0):
+    calculator = ATRCalculator()
+    simulator = SPXPriceSimulator(rng=np.random.default_rng(seed))
+    for timeframe in timeframes:
+        for open_, high, low, close in simulator.generate_ohlc_batch(bars).tolist():
+            calculator.add_price_data(timeframe, high, low, close)
+    return calculator
+
+
+def test_true_range_matches_textbook_definition():
+    """max(H, PC) - min(L, PC) equals max(H-L, |H-PC|, |PC-L|)."""
+    calculator = ATRCalculator()
+    for high, low, prev_close in [(10, 8, 9), (10, 8, 12), (10, 8, 5), (10, 10, 10)]:
+        expected = max(high - low, abs(high - prev_close), abs(prev_close - low))
+        assert calculator.calculate_true_range(high, low, prev_close) == expected
+
+
+def test_batch_atr_matches_single_timeframe():
+    """Batched ATR agrees with calculate_atr for every timeframe."""
+    timeframes = ["day", "multiday", "swing"]
+    calculator = _loaded_calculator(timeframes)
+
+    batch = calculator.calculate_atr_batch()
+
+    for timeframe in timeframes:
+        assert np.isclose(batch[timeframe], calculator.calculate_atr(timeframe))
+
+
+def test_levels_are_symmetric_around_previous_close():
+    """Upper and lower levels sit the same distance from the previous close."""
+    calculator = _loaded_calculator(["day"])
+
+    levels = calculator.calculate_atr_levels("day")
+
+    assert levels is not None
+    for suffix in ("trigger", "0382", "0618", "1000", "2000"):
+        upper = getattr(levels, f"upper_{suffix}") - levels.previous_close
+        lower = levels.previous_close - getattr(levels, f"lower_{suffix}")
+        assert np.isclose(upper, lower)
@@ -0,0 +1,129 @@
+"""Tests for ATR strategy generation and evaluation."""
+
+import asyncio
+import importlib
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+
+# Allow imports from the backend directory
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "whispr", "backend"))
+
+SPECIFICATION = {
+    "timeframes": ["day", "multiday"],
+    "adjacent_rules": {
+        "GG_Open": {"key": "0382", "description": "Golden Gate open", "probability": 0.6, "priority": 5},
+    },
+    "multi_level_rules": {
+        "Skip_0618": {"key": "0618", "description": "Skip to .618", "probability": 0.4, "priority": 4},
+    },
+}
+LEVELS = {
+    "day": {"0382": 0.382, "0618": 0.618},
+    "multiday": {"0382": 0.382, "0618": 0.618},
+}
+STRATEGY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strategies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, strategy_expression TEXT,
+    prompt_tpl TEXT, tags TEXT, priority INTEGER, strategy_type TEXT,
+    indicator_ref TEXT, indicator_params TEXT, is_active INTEGER DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS indicators (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE, indicator_type TEXT, config TEXT
+);
+"""
+
+
+def _setup(tmp_path, monkeypatch):
+    spec_path = tmp_path / "atr_rule_specification.json"
+    levels_path = tmp_path / "atr_levels.json"
+    spec_path.write_text(json.dumps(SPECIFICATION))
+    levels_path.write_text(json.dumps(LEVELS))
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "atr.db"))
+
+    import database
+    importlib.reload(database)
+    import atr_strategy
+    importlib.reload(atr_strategy)
+    monkeypatch.setattr(atr_strategy, "_SPEC_PATH", spec_path)
+    monkeypatch.setattr(atr_strategy, "_LEVELS_PATH", levels_path)
+    return database, atr_strategy
+
+
+def test_generation_is_idempotent_and_evaluates(tmp_path, monkeypatch):
+    """Re-running generation adds no rows; batch and scalar evaluation agree."""
+    database, atr_strategy = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        conn = await database.get_db()
+        await conn.executescript(STRATEGY_SCHEMA)
+        generator = atr_strategy.get_atr_strategy_generator()
+
+        assert await generator.generate_atr_strategies() == 8
+        await generator.generate_atr_strategies()
+        rows = await conn.execute_fetchall("SELECT id, name FROM strategies ORDER BY id")
+        assert len(rows) == 8
+
+        prices = np.array([0.5, -0.5, 0.0])
+        triggered = await generator.evaluate_batch(prices, np.array(["SPX", "SPX", "SPX"]))
+        assert triggered.shape == (3, 8)
+        assert not triggered[2].any()
+
+        for column, strategy_id in enumerate(generator._index_ids.tolist()):
+            for row, price in enumerate(prices.tolist()):
+                result = await generator.evaluate_atr_strategy(strategy_id, price, "SPX")
+                assert result["triggered"] == triggered[row, column]
+
+        assert (await generator.evaluate_atr_strategy(999, 0.5, "SPX"))["error"] == "Rule not found"
+        refreshes = []
+        refresh = generator._refresh_index
+
+        async def counting_refresh():
+            refreshes.append(1)
+            await refresh()
+
+        monkeypatch.setattr(generator, "_refresh_index", counting_refresh)
+        assert (await generator.evaluate_atr_strategy(999, 0.5, "SPX"))["error"] == "Rule not found"
+        assert refreshes == []  # the recent miss is cached
+        monkeypatch.setattr(atr_strategy, "MISSING_RULE_REFRESH_SECONDS", 0.0)
+        assert (await generator.evaluate_atr_strategy(999, 0.5, "SPX"))["error"] == "Rule not found"
+        assert refreshes == [1]
+        monkeypatch.setattr(atr_strategy, "MISSING_RULE_CACHE_SIZE", 2)
+        for strategy_id in (1000, 1001, 1002):
+            await generator.evaluate_atr_strategy(strategy_id, 0.5, "SPX")
+        assert list(generator._missing_checked) == [1001, 1002]
+        await database.flush_events()
+        await conn.close()
+
+    asyncio.run(run())
+
+
+def test_fetchall_reconnects_only_after_close(tmp_path, monkeypatch):
+    """Query errors propagate untouched; a closed shared connection is reopened."""
+    database, atr_strategy = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        conn = await database.get_db()
+        await conn.executescript(STRATEGY_SCHEMA)
+        generator = atr_strategy.get_atr_strategy_generator()
+        assert await generator._fetchall("SELECT COUNT(*) FROM strategies") == [(0,)]
+
+        try:
+            await generator._fetchall("SELECT ?", (1, 2))
+        except sqlite3.ProgrammingError:
+            pass
+        else:
+            raise AssertionError("bad binding count was swallowed")
+        assert await database.get_db() is conn and conn._connection is not None
+
+        await conn.close()
+        assert await generator._fetchall("SELECT COUNT(*) FROM strategies") == [(0,)]
+        fresh = await database.get_db()
+        assert fresh is not conn and generator._conn is fresh
+        await fresh.close()
+
+    asyncio.run(run())
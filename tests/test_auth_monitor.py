@@ -0,0 +1,30 @@
+"""Tests for the authentication health monitor."""
+
+import asyncio
+import os
+import sys
+
+
+# Allow imports from the backend directory
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "whispr", "backend"))
+
+from auth_monitor import AuthMonitor  # noqa: E402
+
+
+def test_malformed_files_report_error_instead_of_raising(tmp_path, monkeypatch):
+    """A null expiry or non-object JSON marks the check as an error."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "backend").mkdir()
+    token_file = tmp_path / "backend" / ".schwab_tokens.json"
+    (tmp_path / "backend" / "token_metrics.json").write_text("[1, 2]")
+
+    async def run():
+        monitor = AuthMonitor()
+        for body in ('{"expires_at": null}', '["not", "an", "object"]'):
+            token_file.write_text(body)
+            health = await monitor.get_auth_health()
+            assert health["status"] == "error"
+            assert health["alerts"][0].startswith("Failed to read token file")
+            assert health["metrics"] == {}
+
+    asyncio.run(run())
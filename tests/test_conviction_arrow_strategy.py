@@ -0,0 +1,183 @@
+"""Tests for the hourly conviction arrow strategy."""
+
+import asyncio
+import importlib
+import json
+import os
+import sys
+
+
+# Allow imports from the backend directory
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "whispr", "backend"))
+
+STRATEGY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strategies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, strategy_expression TEXT,
+    prompt_tpl TEXT, tags TEXT, priority INTEGER, strategy_type TEXT, timeframe TEXT,
+    indicator_ref TEXT, indicator_params TEXT, is_active INTEGER DEFAULT 1
+);
+"""
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "arrows.db"))
+
+    import database
+    importlib.reload(database)
+    import conviction_arrow_strategy
+    importlib.reload(conviction_arrow_strategy)
+    return database, conviction_arrow_strategy
+
+
+def _arrow(direction):
+    return {"conviction_arrow": {
+        "new_arrow": True, "direction": direction, "ema_13": 10.0, "ema_48": 12.0, "ema_21": 11.5,
+    }}
+
+
+def test_opposite_arrow_fails_pending_arrows(tmp_path, monkeypatch):
+    """A new arrow is recorded and earlier opposite arrows are auto-failed."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        conn = await database.get_db()
+        await conn.executescript(STRATEGY_SCHEMA)
+        strategy = module.ConvictionArrowStrategy()
+        assert await strategy.generate_conviction_arrow_strategy() == 1
+        assert await strategy.generate_conviction_arrow_strategy() == 1
+        assert await module.ConvictionArrowStrategy().generate_conviction_arrow_strategy() == 1
+
+        bullish = await strategy.evaluate_conviction_arrow(1, _arrow("bullish"))
+        assert bullish["triggered"] and bullish["outcome_id"] == 1
+        ((due,),) = await conn.execute_fetchall(
+            "SELECT evaluation_due FROM conviction_arrow_outcomes WHERE julianday(evaluation_due) - julianday(arrow_time) = 3"
+        )
+        assert bullish["evaluation_due"] == due
+        assert (await strategy.evaluate_conviction_arrow(1, _arrow("bearish")))["triggered"]
+        assert not (await strategy.evaluate_conviction_arrow(1, {}))["triggered"]
+        assert (await strategy.evaluate_conviction_arrow(99, _arrow("bullish")))["error"] == "Strategy not found"
+
+        rows = await conn.execute_fetchall(
+            "SELECT direction, evaluated, success FROM conviction_arrow_outcomes ORDER BY id"
+        )
+        assert rows == [("bullish", 1, 0), ("bearish", 0, None)]
+
+        stats = await strategy.get_arrow_statistics()
+        assert (stats["total_signals"], stats["successful"], stats["failed"], stats["pending_evaluation"]) == (2, 0, 1, 1)
+        assert sorted(signal["direction"] for signal in stats["recent_signals"]) == ["bearish", "bullish"]
+        assert not conn.in_transaction
+        assert await strategy.check_pending_evaluations() == []
+
+        await conn.execute("UPDATE conviction_arrow_outcomes SET evaluation_due = datetime('now', '-1 day')")
+        pending = await strategy.check_pending_evaluations()
+        assert [(row["id"], row["direction"]) for row in pending] == [(2, "bearish")]
+        assert [row["id"] async for row in strategy.iter_pending_evaluations()] == [2]
+
+        delivered = asyncio.Queue()
+        watcher = asyncio.create_task(strategy.watch_pending_evaluations(delivered.put))
+        assert [row["id"] for row in await asyncio.wait_for(delivered.get(), 5)] == [2]
+        await conn.execute("UPDATE conviction_arrow_outcomes SET evaluation_due = datetime('now', '+1 second') WHERE id = 2")
+        strategy._due_changed.set()
+        assert [row["id"] for row in await asyncio.wait_for(delivered.get(), 5)] == [2]
+        watcher.cancel()
+
+        await strategy.record_arrow_outcome(2, True, "target hit")
+        await database.flush_writes()
+        assert await strategy.check_pending_evaluations() == []
+        rows = await conn.execute_fetchall("SELECT success, evaluation_notes FROM conviction_arrow_outcomes WHERE id = 2")
+        assert rows == [(1, "target hit")]
+        stats = await strategy.get_arrow_statistics()
+        assert (stats["total_signals"], stats["successful"], stats["failed"], stats["pending_evaluation"]) == (2, 1, 1, 0)
+        await strategy.record_arrow_outcome(2, False, "stopped out")
+        await database.flush_writes()
+        stats = await strategy.get_arrow_statistics()
+        assert stats["success_rate"] == 0
+        payload = json.loads(await strategy.get_arrow_statistics_json())
+        fields = payload.pop("recent_signal_fields")
+        recent = [dict(zip(fields, row)) for row in payload.pop("recent_signals")]
+        assert [(signal["direction"], signal["evaluated"], signal["success"]) for signal in recent] == [
+            (signal["direction"], signal["evaluated"], signal["success"]) for signal in stats.pop("recent_signals")
+        ]
+        assert payload == stats
+        await database.flush_events()
+        events = await conn.execute_fetchall("SELECT event_type FROM events WHERE event_type IN ('conviction_arrow_detected', 'conviction_arrow_evaluated')")
+        assert [row[0] for row in events] == ["conviction_arrow_detected"] * 2 + ["conviction_arrow_evaluated"] * 2
+        await database.close_read_pool()
+        await conn.close()
+
+    asyncio.run(run())
+
+
+def test_statistics_counters_seed_from_existing_outcomes(tmp_path, monkeypatch):
+    """Outcomes recorded before the counters existed are counted once."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        conn = await database.get_db()
+        await conn.executescript(module.OUTCOMES_SCHEMA_SQL.split("-- Running totals")[0])
+        await conn.executemany(
+            "INSERT INTO conviction_arrow_outcomes (strategy_id, arrow_time, direction, evaluation_due, evaluated, success)"
+            " VALUES (1, datetime('now'), 'bullish', datetime('now'), ?, ?)",
+            [(1, 1), (1, 0), (1, 1), (0, None)],
+        )
+        stats = await module.ConvictionArrowStrategy().get_arrow_statistics()
+        assert (stats["total_signals"], stats["successful"], stats["failed"], stats["pending_evaluation"]) == (4, 2, 1, 1)
+        assert stats["success_rate"] == 2 / 3
+        await database.close_read_pool()
+        await conn.close()
+
+    asyncio.run(run())
+
+
+def test_watcher_skips_outcomes_still_queued(tmp_path, monkeypatch):
+    """An outcome recorded but not yet written is not handed to the watcher again."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        conn = await database.get_db()
+        await conn.executescript(STRATEGY_SCHEMA)
+        strategy = module.ConvictionArrowStrategy()
+        assert await strategy.generate_conviction_arrow_strategy() == 1
+        assert (await strategy.evaluate_conviction_arrow(1, _arrow("bullish")))["triggered"]
+        await conn.execute("UPDATE conviction_arrow_outcomes SET evaluation_due = datetime('now', '-1 day')")
+
+        delivered = asyncio.Queue()
+        watcher = asyncio.create_task(strategy.watch_pending_evaluations(delivered.put))
+        assert [row["id"] for row in await asyncio.wait_for(delivered.get(), 5)] == [1]
+        await strategy.record_arrow_outcome(1, True, "target hit")
+        strategy._due_changed.set()
+        await asyncio.sleep(0.3)
+        assert delivered.empty()
+        watcher.cancel()
+
+        await database.flush_events()
+        await database.close_read_pool()
+        await conn.close()
+
+    asyncio.run(run())
+
+
+def test_schema_setup_waits_for_open_transaction(tmp_path, monkeypatch):
+    """The schema script cannot commit another task's transaction halfway."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        conn = await database.get_db()
+
+        class Abort(Exception):
+            pass
+
+        try:
+            async with database.transaction() as tx:
+                await tx.execute("INSERT INTO events (ts, event_type) VALUES (datetime('now'), 'rolled_back')")
+                setup = asyncio.create_task(module._ensure_schema())
+                await asyncio.sleep(0.2)
+                assert not setup.done()
+                raise Abort
+        except Abort:
+            pass
+        await setup
+        assert await conn.execute_fetchall("SELECT event_type FROM events") == []
+        await conn.close()
+
+    asyncio.run(run())
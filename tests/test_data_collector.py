@@ -0,0 +1,343 @@
+"""Tests for the Schwab REST data collector."""
+
+import asyncio
+import importlib
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+# Allow imports from the backend directory
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "whispr", "backend"))
+
+QUOTES = {
+    "$SPX": {"quote": {"lastPrice": 5000.0, "highPrice": 5010.0, "lowPrice": 4990.0, "totalVolume": 7}},
+    "AAPL": {"lastPrice": 200.0, "bidPrice": 199.9},
+}
+
+CANDLES = [
+    {"datetime": 1700000000123 + 60000 * i, "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i, "close": 1.5 + i, "volume": 10 * i}
+    for i in range(3)
+]
+
+
+class FakeOAuthManager:
+    loads = 0
+
+    async def load_tokens(self):
+        self.loads += 1
+
+    async def get_valid_access_token(self):
+        return "token"
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "collector.db"))
+
+    import database
+    importlib.reload(database)
+    import data_collector
+    importlib.reload(data_collector)
+    return database, data_collector
+
+
+async def _serve(requests, statuses=()):
+    statuses = list(statuses)
+
+    async def quotes(request):
+        requests.append(request)
+        if statuses:
+            return web.Response(status=statuses.pop(0), headers={"Retry-After": "0.3"})
+        return web.json_response(QUOTES)
+
+    async def pricehistory(request):
+        requests.append(request)
+        return web.json_response({"candles": CANDLES, "symbol": request.query["symbol"]})
+
+    app = web.Application()
+    app.router.add_get("/marketdata/v1/quotes", quotes)
+    app.router.add_get("/marketdata/v1/pricehistory", pricehistory)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def test_requests_share_one_session(tmp_path, monkeypatch):
+    """Quotes are fetched over one pooled session that disconnect closes."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests)
+        oauth = FakeOAuthManager()
+        collector = module.SchwabDataCollector(oauth)
+        collector.base_url = str(server.make_url("")).rstrip("/")
+
+        assert await collector.connect()
+        session = collector._session
+        tick = await collector.get_current_price("SPX")
+        assert (tick.price, tick.high, tick.low, tick.volume) == (5000.0, 5010.0, 4990.0, 7)
+        assert collector._session is session
+        assert [request.query["symbols"] for request in requests] == ["$SPX"] * 2
+        assert requests[0].headers["Authorization"] == "Bearer token"
+        assert oauth.loads == 1
+        stats = collector.get_stats()
+        assert (stats["api_requests"], stats["successful_requests"], stats["success_rate_percent"]) == (2, 2, 100)
+        assert abs((datetime.fromisoformat(stats["last_request_time"]) - datetime.now()).total_seconds()) < 60
+
+        await collector.disconnect()
+        assert session.closed and collector._session is None
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_stream_fetches_every_symbol_in_one_request(tmp_path, monkeypatch, caplog):
+    """Each streaming cycle is a single batched quote request."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests)
+        collector = module.SchwabDataCollector(FakeOAuthManager())
+        collector.base_url = str(server.make_url("")).rstrip("/")
+        assert await collector.connect()
+
+        caplog.set_level(logging.DEBUG, logger=module.logger.name)  # spx_tick events are debug-only
+        stream = collector.stream_real_time(["SPX", "AAPL"], interval_seconds=0)
+        ticks = [await stream.__anext__()]
+        await asyncio.sleep(0.6)  # polling carries on while the consumer is idle
+        assert len(requests) == 3
+        ticks += [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+        assert [(tick.symbol, tick.price) for tick in ticks] == [("SPX", 5000.0), ("AAPL", 200.0)] * 2
+        assert ticks[1].bid == 199.9 and ticks[1].timestamp == ticks[0].timestamp
+        assert [request.query["symbols"] for request in requests[1:]] == ["$SPX,AAPL"] * 2
+        assert requests[1].raw_path == "/marketdata/v1/quotes?symbols=%24SPX,AAPL"
+
+        await collector.disconnect()
+        await server.close()
+        await database.flush_events()
+        conn = await database.get_db()
+        events = await conn.execute_fetchall("SELECT payload FROM events WHERE event_type = 'spx_tick'")
+        assert len(events) >= 2
+        await conn.close()
+
+    asyncio.run(run())
+
+
+def test_rate_limited_response_pauses_later_requests(tmp_path, monkeypatch):
+    """A 429 holds back the next request for the Retry-After delay."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests, statuses=[429])
+        collector = module.SchwabDataCollector(FakeOAuthManager())
+        collector.base_url = str(server.make_url("")).rstrip("/")
+
+        assert not await collector.connect()
+        started = time.monotonic()
+        assert await collector.connect()
+        assert time.monotonic() - started >= 0.25
+        assert collector.stats["successful_requests"] == 1
+
+        await collector.disconnect()
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_unauthorized_response_reloads_token_and_retries(tmp_path, monkeypatch):
+    """A 401 drops the cached bearer and the request is retried once."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests, statuses=[401, 401, 401])
+        oauth = FakeOAuthManager()
+        collector = module.SchwabDataCollector(oauth)
+        collector.base_url = str(server.make_url("")).rstrip("/")
+
+        assert not await collector.connect()
+        assert (len(requests), oauth.loads) == (2, 2)
+        assert await collector.connect()
+        assert (len(requests), oauth.loads) == (4, 3)
+
+        await collector.disconnect()
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_request_and_consumer_errors_are_counted_apart(tmp_path, monkeypatch, caplog):
+    """A failed request counts once; an error while reading the body is not a request failure."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests, statuses=[500])
+        collector = module.SchwabDataCollector(FakeOAuthManager())
+        collector.base_url = str(server.make_url("")).rstrip("/")
+
+        assert not await collector.connect()
+        assert (collector.stats["successful_requests"], collector.stats["failed_requests"]) == (0, 1)
+
+        caplog.clear()
+        try:
+            async with collector._open_api_request("/marketdata/v1/quotes", {"symbols": "$SPX"}):
+                raise KeyError("datetime")
+        except KeyError:
+            pass
+        assert (collector.stats["successful_requests"], collector.stats["failed_requests"]) == (1, 1)
+        assert "Schwab API request error" not in caplog.text
+        assert collector._request_slots._value == module.MAX_CONCURRENT_REQUESTS
+
+        await collector.disconnect()
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_price_history_parses_into_arrays_and_candles(tmp_path, monkeypatch):
+    """Candles come back as a structured array or as matching OHLCCandles."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests)
+        collector = module.SchwabDataCollector(FakeOAuthManager())
+        collector.base_url = str(server.make_url("")).rstrip("/")
+
+        monkeypatch.setattr(module, "CANDLE_BUFFER_SIZE", 2)  # grow the streamed array once
+        bars = await collector.get_minute_data("SPX", materialize=False)
+        assert bars.dtype == module.CANDLE_DTYPE
+        assert bars["ts"].tolist() == [candle["datetime"] for candle in CANDLES]
+        assert bars["c"].tolist() == [candle["close"] for candle in CANDLES]
+        assert requests[-1].query["symbol"] == "$SPX" and requests[-1].query["needExtendedHoursData"] == "false"
+        monkeypatch.setattr(module, "ijson", None)  # decode the whole body instead of streaming
+        assert (await collector.get_minute_data("SPX", materialize=False)).tolist() == bars.tolist()
+
+        candles = await collector.get_daily_data("SPX")
+        assert candles == [
+            module.OHLCCandle(
+                "SPX", datetime.fromtimestamp(candle["datetime"] / 1000, timezone.utc), candle["open"],
+                candle["high"], candle["low"], candle["close"], candle["volume"], "1d",
+            )
+            for candle in CANDLES
+        ]
+
+        await collector.disconnect()
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_aggregate_ohlc_matches_grouped_reference(tmp_path, monkeypatch):
+    """Minute bars roll up into window-aligned OHLCV buckets."""
+    _, module = _setup(tmp_path, monkeypatch)
+    rng = np.random.default_rng(0)
+    minutes = np.sort(rng.choice(600, size=200, replace=False))
+    bars = np.zeros(len(minutes), dtype=module.CANDLE_DTYPE)
+    bars["ts"] = 1_700_000_040_000 + minutes * 60_000
+    for name in ("o", "h", "l", "c"):
+        bars[name] = rng.normal(5000, 5, len(bars))
+    bars["v"] = rng.integers(0, 100, len(bars))
+
+    aggregated = module.aggregate_ohlc(bars, 5)
+
+    window = 5 * 60_000
+    starts = sorted({ts // window * window for ts in bars["ts"].tolist()})
+    assert aggregated["ts"].tolist() == starts
+    for bar, start in zip(aggregated.tolist(), starts):
+        group = bars[bars["ts"] // window * window == start]
+        assert bar == (start, group["o"][0], group["h"].max(), group["l"].min(), group["c"][-1], group["v"].sum())
+
+
+def test_bundle_fetches_history_concurrently_after_one_connect(tmp_path, monkeypatch):
+    """Minute and daily history share a single lazy connect and run together."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests)
+        collector = module.SchwabDataCollector(FakeOAuthManager())
+        collector.base_url = str(server.make_url("")).rstrip("/")
+        monkeypatch.setattr(module, "_global_collector", collector)
+
+        minute, daily = await module.get_spx_bundle(2, 5)
+        assert [candle.timeframe for candle in minute + daily] == ["1m"] * 3 + ["1d"] * 3
+        assert [request.path for request in requests].count("/marketdata/v1/quotes") == 1
+        assert sorted((request.query["frequencyType"], request.query["period"]) for request in requests[1:]) == [
+            ("daily", "5"), ("minute", "2"),
+        ]
+
+        await collector.disconnect()
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_concurrent_first_callers_share_one_global_collector(tmp_path, monkeypatch):
+    """Racing get_data_collector calls build and connect a single collector."""
+    database, module = _setup(tmp_path, monkeypatch)
+
+    async def run():
+        requests = []
+        server = await _serve(requests)
+        base_url = str(server.make_url("")).rstrip("/")
+
+        class LocalCollector(module.SchwabDataCollector):
+            def __init__(self, oauth_manager):
+                super().__init__(oauth_manager)
+                self.base_url = base_url
+
+        monkeypatch.setattr(module, "SchwabDataCollector", LocalCollector)
+        monkeypatch.setattr(module, "_global_collector", None)
+
+        collectors = await asyncio.gather(*(module.get_data_collector(FakeOAuthManager()) for _ in range(3)))
+        assert collectors[0] is collectors[1] is collectors[2]
+        assert len(requests) == 1
+
+        await collectors[0].disconnect()
+        await server.close()
+        await database.flush_events()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_candles_atr_matches_atr_calculator(tmp_path, monkeypatch):
+    """The candle-array ATR kernel agrees with ATRCalculator.calculate_atr."""
+    from atr_calculator import ATRCalculator, SPXPriceSimulator
+
+    _, module = _setup(tmp_path, monkeypatch)
+    ohlc = SPXPriceSimulator(rng=np.random.default_rng(1)).generate_ohlc_batch(40)
+    bars = np.zeros(len(ohlc), dtype=module.CANDLE_DTYPE)
+    bars["o"], bars["h"], bars["l"], bars["c"] = ohlc.T
+
+    calculator = ATRCalculator()
+    for _, high, low, close in ohlc.tolist():
+        calculator.add_price_data("day", high, low, close)
+
+    # The calculator keeps only its last atr_length + 10 bars
+    assert np.isclose(module.candles_atr(bars[-24:]), calculator.calculate_atr("day"), rtol=1e-12)
+    assert module.candles_atr(bars[:15]) is None
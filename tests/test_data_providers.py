@@ -0,0 +1,76 @@
+"""Tests for the Schwab streamer data provider."""
+
+import asyncio
+import json
+import os
+import sys
+
+import websockets
+
+
+# Allow imports from the backend directory
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "whispr", "backend"))
+
+import data_providers  # noqa: E402
+
+QUOTE = {"key": "SPY", "3": 500.25, "1": 500.2, "2": 500.3, "8": 1200, "10": 501.0, "11": 499.0,
+         "12": 498.0, "17": 499.5, "18": 2.25, "42": 0.45, "34": 1700000000000}
+
+
+async def _streamer(received):
+    """A streamer that records each frame's commands and answers each SUBS with one quote."""
+    async def handler(websocket):
+        async for frame in websocket:
+            requests = json.loads(frame)["requests"]
+            received.append([request["command"] for request in requests])
+            for request in requests:
+                if request["command"] == "LOGIN":
+                    await websocket.send(json.dumps({"response": [{"command": "LOGIN", "content": {"code": 0}}]}))
+                elif request["command"] == "SUBS":
+                    await websocket.send(json.dumps({"response": [{"command": "SUBS", "content": {"code": 0}}]}))
+                    await websocket.send(json.dumps({"data": [{"service": request["service"], "content": [QUOTE]}]}))
+                elif request["command"] == "LOGOUT":
+                    await websocket.close()
+
+    return await websockets.serve(handler, "127.0.0.1", 0)
+
+
+def test_streamer_logs_in_subscribes_and_delivers_quotes():
+    """The login carries the first subscription and quotes come back as MarketData."""
+
+    async def run():
+        received = []
+        server = await _streamer(received)
+        provider = data_providers.SchwabStreamerProvider("token", "customer")
+        provider.streamer_url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+        quotes = asyncio.Queue()
+        assert await provider.subscribe_to_symbols(["spy"], quotes.put)
+        streaming = asyncio.create_task(provider.start_streaming())
+        quote = await asyncio.wait_for(quotes.get(), 5)
+
+        assert (quote.symbol, quote.price, quote.bid, quote.ask, quote.volume) == ("SPY", 500.25, 500.2, 500.3, 1200)
+        assert (quote.high, quote.low, quote.open, quote.previous_close) == (501.0, 499.0, 499.5, 498.0)
+        assert (quote.change, quote.change_percent, quote.provider) == (2.25, 0.45, "schwab_streamer")
+        assert received == [["LOGIN", "SUBS"]]
+
+        assert await provider.subscribe_to_symbols([("LEVELONE_EQUITIES", ["qqq"]), ("LEVELONE_EQUITIES", ["iwm"])])
+        await asyncio.sleep(0.1)
+        assert received[1:] == [["SUBS", "SUBS"]]
+        assert set(provider.data_callbacks) == {"SPY", "QQQ", "IWM"}
+
+        await provider.disconnect()
+        await asyncio.wait_for(streaming, 5)
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_partial_equity_update_falls_back_to_last_price():
+    """Fields missing from a partial update default as before."""
+    provider = data_providers.SchwabStreamerProvider("token", "customer")
+    quote = provider._parse_equity_data({"key": "SPY", "3": 501.0, "8": 5})
+    assert (quote.price, quote.bid, quote.ask, quote.high, quote.low, quote.open, quote.previous_close) == (501.0,) * 7
+    assert (quote.volume, quote.change, quote.change_percent) == (5, 0, 0)
+    assert not hasattr(quote, "__dict__") and {quote: 1}[quote] == 1
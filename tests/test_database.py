@@ -3,6 +3,7 @@
 import asyncio
 import importlib
 import os
+import sqlite3
 import sys
 
 
@@ -31,3 +32,146 @@ def test_tables_created(tmp_path, monkeypatch):
 
     asyncio.run(run())
 
+
+
+def test_batched_and_queued_events_are_written(tmp_path, monkeypatch):
+    """log_events and log_event_nowait both land rows in the events table."""
+
+    async def run():
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "events.db"))
+
+        import database
+        importlib.reload(database)
+
+        await database.log_events([("a", {"n": 1}), ("b", {"n": 2})])
+        for n in range(3):
+            database.log_event_nowait("c", {"n": n})
+        await database.flush_events()
+
+        conn = await database.get_db()
+        rows = await conn.execute_fetchall("SELECT event_type FROM events ORDER BY id")
+        assert [row[0] for row in rows] == ["a", "b", "c", "c", "c"]
+        await conn.close()
+
+    asyncio.run(run())
+
+
+def test_read_pool_sees_committed_writes_and_rejects_writes(tmp_path, monkeypatch):
+    """Pooled readers run in WAL mode, see the writer's rows and cannot write."""
+
+    async def run():
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "pool.db"))
+
+        import database
+        importlib.reload(database)
+
+        await database.log_events([("a", {"n": 1})])
+        counts = await asyncio.gather(
+            *(database.read_fetchall("SELECT COUNT(*) FROM events") for _ in range(8))
+        )
+        assert [[tuple(row) for row in rows] for rows in counts] == [[(1,)]] * 8
+        assert len(database.get_read_pool()._conns) <= database.READ_POOL_SIZE
+
+        async with database.get_read_pool().acquire() as reader:
+            (mode,) = await reader.execute_fetchall("PRAGMA journal_mode")
+            assert mode["journal_mode"] == "wal"
+            try:
+                await reader.execute("DELETE FROM events")
+            except sqlite3.OperationalError:
+                pass
+            else:
+                raise AssertionError("read pool connection accepted a write")
+
+        await database.close_read_pool()
+        await (await database.get_db()).close()
+
+    asyncio.run(run())
+
+
+def test_read_pool_closes_connection_when_pragmas_fail(tmp_path, monkeypatch):
+    """A connection whose setup script fails is closed, not leaked."""
+
+    async def run():
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "bad.db"))
+
+        import aiosqlite
+        import database
+        importlib.reload(database)
+
+        closed = []
+        close = aiosqlite.Connection.close
+
+        async def recording_close(self):
+            closed.append(self)
+            await close(self)
+
+        monkeypatch.setattr(aiosqlite.Connection, "close", recording_close)
+        pool = database.ReadPool(pragmas="PRAGMA nonsense(;")
+        try:
+            async with pool.acquire():
+                raise AssertionError("setup script should have failed")
+        except sqlite3.OperationalError:
+            pass
+        assert len(closed) == 1 and pool._conns == [] and pool._opening == 0
+
+    asyncio.run(run())
+
+
+def test_read_pool_close_does_not_requeue_borrowed_connections(tmp_path, monkeypatch):
+    """A connection borrowed across close() is closed on return, never handed out again."""
+
+    async def run():
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "close.db"))
+
+        import database
+        importlib.reload(database)
+
+        pool = database.ReadPool(size=1)
+        async with pool.acquire() as idle:
+            pass
+        async with pool.acquire() as borrowed:
+            assert borrowed is idle
+            await pool.close()
+            assert borrowed._connection is not None  # still usable by its borrower
+        assert borrowed._connection is None
+        async with pool.acquire() as fresh:
+            assert fresh is not borrowed
+            assert [tuple(row) for row in await fresh.execute_fetchall("SELECT 1")] == [(1,)]
+        await pool.close()
+        assert fresh._connection is None
+
+    asyncio.run(run())
+
+
+def test_event_writes_wait_for_open_transaction(tmp_path, monkeypatch):
+    """An event logged while another task's transaction is open survives its rollback."""
+
+    async def run():
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "tx.db"))
+
+        import database
+        importlib.reload(database)
+        conn = await database.get_db()
+
+        class Abort(Exception):
+            pass
+
+        try:
+            async with database.transaction() as tx:
+                await tx.execute(database.INSERT_EVENT_SQL, ("rolled_back", "{}"))
+                database.log_event_nowait("queued", {})
+                logged = asyncio.create_task(database.log_event("direct", {}))
+                await asyncio.sleep(0.2)  # both writers are now waiting on the transaction
+                assert not logged.done()
+                await database.log_event("inside", {})  # the owning task does not deadlock
+                raise Abort
+        except Abort:
+            pass
+        await logged
+        await database.flush_events()
+
+        rows = await conn.execute_fetchall("SELECT event_type FROM events ORDER BY id")
+        assert sorted(row[0] for row in rows) == ["direct", "queued"]
+        await conn.close()
+
+    asyncio.run(run())
@@ -6,12 +6,39 @@ Calculates ATR levels exactly as they appear in the ThinkScript indicator.
 
 import math
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
-@dataclass
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to the pure-Python kernel
+    njit = None
+
+
+def _wilder_atr(true_ranges, length):
+    """
+    Wilder's smoothing (like ThinkScript WildersAverage).
+    First ATR is a simple average, then ATR = ((previous_ATR * (n-1)) + current_TR) / n
+    """
+    current_atr = true_ranges[:length].sum() / length
+    
+    for i in range(length, len(true_ranges)):
+        current_atr = ((current_atr * (length - 1)) + true_ranges[i]) / length
+    
+    return current_atr
+
+
+if njit is not None:
+    # Explicit signature compiles eagerly at import; cache=True persists the machine
+    # code in __pycache__ so restarts load it instead of re-running the JIT.
+    # No fastmath: reassociating the recurrence would break bit-parity with ToS.
+    _wilder_atr = njit("float64(float64[::1], int64)", cache=True)(_wilder_atr)
+
+@dataclass(slots=True, frozen=True)
 class ATRLevels:
-    """Container for all ATR levels."""
+    """Container for all ATR levels (immutable once calculated)."""
     previous_close: float
     atr: float
     timeframe: str
@@ -44,15 +71,28 @@ class ATRLevels:
     true_range: float = 0.0
     tr_percent_of_atr: float = 0.0
 
+@dataclass(slots=True)
+class TimeframeBuffer:
+    """Rolling high/low/close history for one timeframe."""
+    closes: List[float] = field(default_factory=list)
+    highs: List[float] = field(default_factory=list)
+    lows: List[float] = field(default_factory=list)
+
 class ATRCalculator:
     """Calculates ATR levels using the exact logic from Saty's ThinkScript."""
     
-    def __init__(self, atr_length: int = 14, trigger_percentage: float = 0.236):
+    def __init__(self, atr_length: int = 14, trigger_percentage: float = 0.236,
+                 price_dtype: type = np.float64):
+        """
+        Args:
+            price_dtype: dtype for the True Range computation. np.float32 halves memory
+                bandwidth for large symbol universes; the default float64 keeps exact
+                ThinkScript parity. Wilder smoothing always runs in float64.
+        """
         self.atr_length = atr_length
         self.trigger_percentage = trigger_percentage
-        self.price_history: Dict[str, List[float]] = {}
-        self.high_history: Dict[str, List[float]] = {}
-        self.low_history: Dict[str, List[float]] = {}
+        self.price_dtype = price_dtype
+        self.state: Dict[str, TimeframeBuffer] = {}
         
         # Optimized periods for different timeframes (from our testing)
         self.timeframe_periods = {
@@ -65,70 +105,102 @@ class ATRCalculator:
         
     def add_price_data(self, timeframe: str, high: float, low: float, close: float):
         """Add price data for ATR calculation."""
-        if timeframe not in self.price_history:
-            self.price_history[timeframe] = []
-            self.high_history[timeframe] = []
-            self.low_history[timeframe] = []
+        buffer = self.state.get(timeframe)
+        if buffer is None:
+            buffer = self.state[timeframe] = TimeframeBuffer()
         
         # Keep only what we need for ATR calculation
         max_history = self.atr_length + 10  # Buffer for accuracy
         
-        self.price_history[timeframe].append(close)
-        self.high_history[timeframe].append(high)
-        self.low_history[timeframe].append(low)
+        buffer.closes.append(close)
+        buffer.highs.append(high)
+        buffer.lows.append(low)
         
-        if len(self.price_history[timeframe]) > max_history:
-            self.price_history[timeframe] = self.price_history[timeframe][-max_history:]
-            self.high_history[timeframe] = self.high_history[timeframe][-max_history:]
-            self.low_history[timeframe] = self.low_history[timeframe][-max_history:]
+        if len(buffer.closes) > max_history:
+            del buffer.closes[:-max_history]
+            del buffer.highs[:-max_history]
+            del buffer.lows[:-max_history]
     
     def calculate_true_range(self, high: float, low: float, prev_close: float) -> float:
-        """Calculate True Range: max(H-L, H-PC, PC-L)"""
-        return max(
-            high - low,
-            abs(high - prev_close),
-            abs(prev_close - low)
-        )
+        """
+        Calculate True Range: max(H-L, |H-PC|, |PC-L|).
+        For H >= L this equals max(H, PC) - min(L, PC), which needs no abs().
+        """
+        return max(high, prev_close) - min(low, prev_close)
     
     def calculate_atr(self, timeframe: str) -> Optional[float]:
         """Calculate ATR using Wilder's smoothing - PREVIOUS period like ThinkScript [1]."""
-        if timeframe not in self.price_history:
+        buffer = self.state.get(timeframe)
+        if buffer is None:
             return None
             
-        prices = self.price_history[timeframe]
-        highs = self.high_history[timeframe]
-        lows = self.low_history[timeframe]
-        
-        if len(prices) < self.atr_length + 2:  # Need extra period for previous calculation
+        if len(buffer.closes) < self.atr_length + 2:  # Need extra period for previous calculation
             return None
         
+        prices = np.asarray(buffer.closes, dtype=self.price_dtype)
+        highs = np.asarray(buffer.highs, dtype=self.price_dtype)
+        lows = np.asarray(buffer.lows, dtype=self.price_dtype)
+        
         # Calculate true ranges - EXCLUDE the most recent period (like ThinkScript [1])
-        true_ranges = []
-        for i in range(1, len(prices) - 1):  # Stop before the last period
-            tr = self.calculate_true_range(highs[i], lows[i], prices[i-1])
-            true_ranges.append(tr)
+        high, low, prev_close = highs[1:-1], lows[1:-1], prices[:-2]
+        true_ranges = (
+            np.maximum(high, prev_close) - np.minimum(low, prev_close)
+        ).astype(np.float64)
         
         if len(true_ranges) < self.atr_length:
             return None
         
-        # Wilder's smoothing (like ThinkScript WildersAverage)
-        # First ATR is simple average
-        first_atr = sum(true_ranges[:self.atr_length]) / self.atr_length
-        
-        # Subsequent values use Wilder's smoothing: 
-        # ATR = ((previous_ATR * (n-1)) + current_TR) / n
-        current_atr = first_atr
-        for i in range(self.atr_length, len(true_ranges)):
-            current_atr = ((current_atr * (self.atr_length - 1)) + true_ranges[i]) / self.atr_length
+        return float(_wilder_atr(true_ranges, self.atr_length))  # Use full precision like ToS
+    
+    def calculate_atr_batch(self, timeframes: Optional[List[str]] = None) -> Dict[str, Optional[float]]:
+        """
+        Calculate ATR for several timeframes in one pass.
+        Timeframes with the same history length (the steady state once buffers are full)
+        are stacked into a (T, L) matrix so True Range and Wilder smoothing run across
+        all T rows at once. The seed average and recurrence run in the same order as
+        calculate_atr, so results are identical to it.
+        """
+        if timeframes is None:
+            timeframes = list(self.state)
+        
+        results: Dict[str, Optional[float]] = {timeframe: None for timeframe in timeframes}
+        
+        # Group by history length - only equal-length rows can share a matrix
+        groups: Dict[int, List[str]] = {}
+        for timeframe in timeframes:
+            buffer = self.state.get(timeframe)
+            if buffer is not None and len(buffer.closes) >= self.atr_length + 2:
+                groups.setdefault(len(buffer.closes), []).append(timeframe)
+        
+        n = self.atr_length
+        for group in groups.values():
+            buffers = [self.state[tf] for tf in group]
+            prices = np.array([b.closes for b in buffers], dtype=self.price_dtype)
+            highs = np.array([b.highs for b in buffers], dtype=self.price_dtype)
+            lows = np.array([b.lows for b in buffers], dtype=self.price_dtype)
+            
+            # True ranges per row - EXCLUDE the most recent period (like ThinkScript [1])
+            high, low, prev_close = highs[:, 1:-1], lows[:, 1:-1], prices[:, :-2]
+            true_ranges = (
+                np.maximum(high, prev_close) - np.minimum(low, prev_close)
+            ).astype(np.float64)
+            
+            # Wilder's smoothing, one column at a time across all timeframes
+            atr = true_ranges[:, :n].sum(axis=1) / n
+            for i in range(n, true_ranges.shape[1]):
+                atr = ((atr * (n - 1)) + true_ranges[:, i]) / n
+            
+            results.update(zip(group, atr.tolist()))
         
-        return current_atr  # Use full precision like ToS
+        return results
     
     def calculate_atr_levels(self, timeframe: str, current_high: float = None, current_low: float = None) -> Optional[ATRLevels]:
         """Calculate all ATR levels for a timeframe using exact ThinkScript logic."""
-        if timeframe not in self.price_history:
+        buffer = self.state.get(timeframe)
+        if buffer is None:
             return None
             
-        prices = self.price_history[timeframe]
+        prices = buffer.closes
         if len(prices) < 2:
             return None
         
@@ -147,29 +219,37 @@ class ATRCalculator:
             true_range = current_high - current_low
             tr_percent_of_atr = round((true_range / atr) * 100, 0) if atr > 0 else 0
         
-        # Calculate all levels using exact ThinkScript formulas
+        # Calculate all levels using exact ThinkScript formulas.
+        # Each ATR offset is computed once and shared by the lower/upper pair;
+        # levels stay unrounded floats to match ToS (see fix_double_rounding.py).
+        trigger_offset = self.trigger_percentage * atr
+        offset_0236 = atr * 0.236
+        offset_0382 = atr * 0.382
+        offset_0500 = atr * 0.5
+        offset_0618 = atr * 0.618
+        offset_0786 = atr * 0.786
         
         # Trigger levels
-        lower_trigger = previous_close - (self.trigger_percentage * atr)
-        upper_trigger = previous_close + (self.trigger_percentage * atr)
+        lower_trigger = previous_close - trigger_offset
+        upper_trigger = previous_close + trigger_offset
         
         # Fibonacci levels
-        lower_0382 = previous_close - (atr * 0.382)
-        upper_0382 = previous_close + (atr * 0.382)
-        lower_0500 = previous_close - (atr * 0.5)
-        upper_0500 = previous_close + (atr * 0.5)
-        lower_0618 = previous_close - (atr * 0.618)
-        upper_0618 = previous_close + (atr * 0.618)
-        lower_0786 = previous_close - (atr * 0.786)
-        upper_0786 = previous_close + (atr * 0.786)
+        lower_0382 = previous_close - offset_0382
+        upper_0382 = previous_close + offset_0382
+        lower_0500 = previous_close - offset_0500
+        upper_0500 = previous_close + offset_0500
+        lower_0618 = previous_close - offset_0618
+        upper_0618 = previous_close + offset_0618
+        lower_0786 = previous_close - offset_0786
+        upper_0786 = previous_close + offset_0786
         lower_1000 = previous_close - atr
         upper_1000 = previous_close + atr
         
         # Extension levels (based on 1000 level)
-        lower_1236 = lower_1000 - (atr * 0.236)
-        upper_1236 = upper_1000 + (atr * 0.236)
-        lower_1618 = lower_1000 - (atr * 0.618)
-        upper_1618 = upper_1000 + (atr * 0.618)
+        lower_1236 = lower_1000 - offset_0236
+        upper_1236 = upper_1000 + offset_0236
+        lower_1618 = lower_1000 - offset_0618
+        upper_1618 = upper_1000 + offset_0618
         lower_2000 = lower_1000 - atr
         upper_2000 = upper_1000 + atr
         
@@ -255,42 +335,40 @@ class ATRCalculator:
 class SPXPriceSimulator:
     """Generates realistic SPX OHLC data for testing ATR calculations."""
     
-    def __init__(self, base_price: float = 4500.0):
+    def __init__(self, base_price: float = 4500.0, rng: Optional[np.random.Generator] = None):
         self.base_price = base_price
         self.current_price = base_price
-        
-    def generate_ohlc_bar(self, volatility: float = 0.01) -> Dict[str, float]:
-        """Generate a single OHLC bar."""
-        import random
-        
-        # Random walk with mean reversion
-        change_percent = random.gauss(0, volatility)
-        price_change = self.current_price * change_percent
-        
-        new_price = self.current_price + price_change
-        
-        # Ensure reasonable bounds
-        new_price = max(4000, min(5000, new_price))
-        
-        # Generate OHLC around the new price
-        range_size = abs(price_change) + random.uniform(1.0, 5.0)
-        
-        high = new_price + random.uniform(0, range_size)
-        low = new_price - random.uniform(0, range_size)
-        open_price = self.current_price
-        close = new_price
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def generate_ohlc_batch(self, n: int, volatility: float = 0.01) -> np.ndarray:
+        """Generate n consecutive OHLC bars as an (n, 4) array of open/high/low/close."""
+        # Random walk with mean reversion, kept within reasonable bounds
+        changes = self.rng.normal(0, volatility, n)
+        closes = np.clip(self.current_price * np.cumprod(1.0 + changes), 4000, 5000)
+        opens = np.concatenate(([self.current_price], closes[:-1]))
+        
+        # Generate OHLC around each new price
+        range_sizes = np.abs(opens * changes) + self.rng.uniform(1.0, 5.0, n)
+        highs = closes + self.rng.uniform(0, range_sizes)
+        lows = closes - self.rng.uniform(0, range_sizes)
         
         # Ensure OHLC consistency
-        high = max(high, open_price, close)
-        low = min(low, open_price, close)
+        highs = np.maximum(highs, np.maximum(opens, closes))
+        lows = np.minimum(lows, np.minimum(opens, closes))
+        
+        self.current_price = float(closes[-1])
         
-        self.current_price = close
+        return np.round(np.column_stack((opens, highs, lows, closes)), 2)
+    
+    def generate_ohlc_bar(self, volatility: float = 0.01) -> Dict[str, float]:
+        """Generate a single OHLC bar."""
+        open_price, high, low, close = self.generate_ohlc_batch(1, volatility)[0].tolist()
         
         return {
-            "open": round(open_price, 2),
-            "high": round(high, 2),
-            "low": round(low, 2),
-            "close": round(close, 2)
+            "open": open_price,
+            "high": high,
+            "low": low,
+            "close": close
         }
 
 
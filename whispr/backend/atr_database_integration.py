@@ -6,9 +6,12 @@ Replace API-based bootstrap with database-based bootstrap
 
 import sqlite3
 from datetime import datetime, timezone
-from typing import List
 from dataclasses import dataclass
 
+import numpy as np
+
+from timeframe_aggregator import CANDLE_ROW_DTYPE, to_utc_datetime64
+
 @dataclass 
 class HistoricalCandle:
     timestamp: datetime
@@ -54,20 +57,31 @@ def create_database_bootstrap_method():
             
             limit = timeframe_limits.get(timeframe, 100)
             
-            # Connect to database
-            conn = sqlite3.connect("/opt/spx-atr/data/spx_tracking.db")
-            cursor = conn.cursor()
+            # Connect read-only (plain tuples - no row factory overhead).
+            # Relies on idx_historical_timeframe_time ON historical_candles(timeframe, timestamp)
+            # (created by historical_backfill.py) so the WHERE + ORDER BY is an index range scan.
+            conn = sqlite3.connect("file:/opt/spx-atr/data/spx_tracking.db?mode=ro", uri=True)
+            conn.row_factory = None
+            # Large page cache, memory-mapped reads, in-memory temp storage,
+            # and a guard against accidental writes
+            conn.executescript("""
+                PRAGMA cache_size=-65536;
+                PRAGMA mmap_size=268435456;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA query_only=1;
+            """)
             
-            # Get historical data
+            # Get historical data in one bulk fetch
+            cursor = conn.cursor()
+            cursor.arraysize = limit
             cursor.execute("""
-                SELECT timestamp, open_price, high_price, low_price, close_price, volume
+                SELECT timestamp, open_price, high_price, low_price, close_price, COALESCE(volume, 0)
                 FROM historical_candles 
                 WHERE timeframe = ?
                 ORDER BY timestamp ASC
                 LIMIT ?
             """, (db_timeframe, limit))
-            
-            results = cursor.fetchall()
+            results = cursor.fetchmany(limit)
             conn.close()
             
             if not results:
@@ -76,13 +90,16 @@ def create_database_bootstrap_method():
             
             logger.info(f"✅ Retrieved {len(results)} historical candles for {timeframe}")
             
+            # Columnar view of the rows: ts / o / h / l / c / v
+            bars = np.fromiter(results, dtype=CANDLE_ROW_DTYPE, count=len(results))
+            
             # Process data based on timeframe
             if timeframe == "scalp":
                 # For scalp (4h), aggregate 1-min data into 4h bars
-                await self._process_minute_data_for_4h(results)
+                await self._process_minute_data_for_4h(bars)
             else:
                 # For other timeframes, use data directly
-                await self._process_historical_bars(results, timeframe)
+                await self._process_historical_bars(bars, timeframe)
                 
             logger.info(f"✅ Bootstrap complete for {timeframe} with {len(results)} bars")
             return True
@@ -91,36 +108,22 @@ def create_database_bootstrap_method():
             logger.error(f"❌ Database bootstrap failed for {timeframe}: {e}")
             return False
     
-    async def _process_minute_data_for_4h(self, minute_data: List):
+    async def _process_minute_data_for_4h(self, minute_data: np.ndarray):
         """Process 1-minute data into 4-hour bars for scalp timeframe"""
-        for row in minute_data:
-            timestamp_str, open_price, high_price, low_price, close_price, volume = row
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            
-            # Feed into aggregator as minute bars
-            self.timeframe_aggregator.add_minute_bar(
-                timestamp, open_price, high_price, low_price, close_price, volume
-            )
+        # Feed the whole column set into the aggregator as minute bars
+        self.timeframe_aggregator.add_bars_bulk(
+            to_utc_datetime64(minute_data['ts']), minute_data['o'], minute_data['h'],
+            minute_data['l'], minute_data['c'], minute_data['v']
+        )
     
-    async def _process_historical_bars(self, historical_data: List, timeframe: str):
+    async def _process_historical_bars(self, historical_data: np.ndarray, timeframe: str):
         """Process historical bars directly for day/multiday/swing/position/long_term"""
-        for row in historical_data:
-            timestamp_str, open_price, high_price, low_price, close_price, volume = row
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            
-            # Feed directly into the appropriate timeframe aggregator
-            if timeframe == "day":
-                self.timeframe_aggregator.add_daily_bar(
-                    timestamp, open_price, high_price, low_price, close_price, volume
-                )
-            elif timeframe == "multiday":
-                self.timeframe_aggregator.add_weekly_bar(
-                    timestamp, open_price, high_price, low_price, close_price, volume
-                )
-            elif timeframe in ["swing", "position", "long_term"]:
-                self.timeframe_aggregator.add_monthly_bar(
-                    timestamp, open_price, high_price, low_price, close_price, volume
-                )
+        # Feed directly into the timeframe's aggregator cache
+        self.timeframe_aggregator.add_bars_bulk(
+            to_utc_datetime64(historical_data['ts']), historical_data['o'], historical_data['h'],
+            historical_data['l'], historical_data['c'], historical_data['v'],
+            timeframe=timeframe
+        )
     '''
     
     return bootstrap_code
@@ -1,8 +1,79 @@
 import json
 import asyncio
+import sqlite3
+import sys
+import time
+import numpy as np
 from datetime import datetime
-from typing import Dict, Any, List
-from database import get_db, log_event
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, FrozenSet, Tuple, NamedTuple, Optional
+from database import get_db, reset_db, log_event, log_events, log_event_nowait, transaction, write_lock
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Data directories for the different service contexts, resolved once at import
+_CANDIDATES = (
+    Path("data"),
+    Path("backend/data"),
+    Path("whispr/backend/data"),
+    Path(__file__).resolve().parent / "data",
+)
+
+def _resolve_data_file(filename: str) -> Optional[Path]:
+    """Return the first candidate path holding ``filename``, or None."""
+    return next((d / filename for d in _CANDIDATES if (d / filename).is_file()), None)
+
+_SPEC_PATH = _resolve_data_file("atr_rule_specification.json")
+_LEVELS_PATH = _resolve_data_file("atr_levels.json")
+
+# Lets INSERT OR IGNORE skip duplicate rule names at the storage layer
+CREATE_NAME_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS idx_strategies_name ON strategies(name)"
+
+INSERT_STRATEGY_SQL = """
+    INSERT OR IGNORE INTO strategies (name, strategy_expression, prompt_tpl, tags, priority, strategy_type, indicator_ref, indicator_params)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# How often an unknown strategy id may trigger a reload of the index
+MISSING_RULE_REFRESH_SECONDS = 30.0
+# Most unknown ids remembered at once; the oldest is forgotten first
+MISSING_RULE_CACHE_SIZE = 1024
+
+class ATRRule(NamedTuple):
+    """In-memory view of one stored ATR strategy, parsed once for evaluation."""
+    expression: str
+    level: float
+    side: str
+    timeframe: Optional[str]
+    rule_type: Optional[str]
+    tag: Optional[str]
+    probability: float
+
+@lru_cache(maxsize=4096)
+def _indicator_params_json(timeframe: str, rule_type: str, tag: str, side: str,
+                           level: float, probability: float) -> str:
+    """Serialize the indicator_params for one rule; the inputs form a small finite set."""
+    return _dumps({
+        "indicator": "atr_levels",
+        "timeframe": timeframe,
+        "rule_type": rule_type,
+        "tag": tag,
+        "side": side,
+        "level": level,
+        "probability": probability
+    })
 
 class ATRStrategyGenerator:
     """Generates and manages ATR-based rules (adjacent and multi-level)."""
@@ -10,258 +81,378 @@ class ATRStrategyGenerator:
     def __init__(self):
         self.specification = self._load_specification()
         self.atr_levels = self._load_atr_levels()
+        
+        # Evaluation index, rebuilt whenever _version moves past _index_version
+        self._strategy_index: Dict[int, ATRRule] = {}
+        self._index_ids = np.empty(0, dtype=np.int64)    # strategy id per column
+        self._levels = np.empty(0, dtype=np.float64)     # trigger level per column
+        self._bull = np.empty(0, dtype=bool)             # True where side == "bull"
+        self._positions: Dict[int, int] = {}             # strategy id -> column
+        self._version = 0
+        self._index_version = -1
+        self._missing_checked: Dict[int, float] = {}    # unknown strategy id -> monotonic time of last reload
+        
+        self._conn = None  # cached get_db() handle, dropped on connection errors
+        self._name_index_ready = False
+        
+        # Compile the spec once: (tag, key, description, probability, priority) tuples
+        self._adj_specs = self._compile_specs(self.specification["adjacent_rules"])
+        self._multi_specs = self._compile_specs(self.specification["multi_level_rules"])
+        
+        # Display names used in rule names, e.g. "day" -> "Day"
+        self._tf_cap: Dict[str, str] = {tf: tf.capitalize() for tf in self.specification["timeframes"]}
+        
+        # Pre-serialized tag lists keyed by (rule_type, timeframe, tag, side)
+        self._tag_json: Dict[Tuple[str, str, str, str], str] = {
+            (rule_type, timeframe, spec[0], side): _dumps([rule_type, timeframe, spec[0], side])
+            for rule_type, specs in (("atr_level", self._adj_specs), ("atr_multi", self._multi_specs))
+            for timeframe in self.specification["timeframes"]
+            for spec in specs
+            for side in ("bull", "bear")
+        }
+        
+        # Interned rule expressions keyed by (level, op), shared across timeframes and rule kinds
+        self._expr_cache: Dict[Tuple[float, str], str] = {}
+        for levels in self.atr_levels.values():
+            for level_value in levels.values():
+                if not isinstance(level_value, (int, float)):
+                    continue
+                self._expr_cache[level_value, ">="] = sys.intern(f"price >= {level_value}")
+                self._expr_cache[level_value, "<="] = sys.intern(f"price <= -{level_value}")
+    
+    @staticmethod
+    def _compile_specs(rules: Dict[str, Dict[str, Any]]) -> Tuple[tuple, ...]:
+        """Flatten a rule spec mapping into immutable per-rule tuples."""
+        return tuple(
+            (tag, spec["key"], spec["description"], spec["probability"], spec["priority"])
+            for tag, spec in rules.items()
+        )
     
     def _load_specification(self) -> Dict[str, Any]:
         """Load the ATR rule specification."""
-        try:
-            with open("data/atr_rule_specification.json", "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            # Try alternative paths for different service contexts
-            try:
-                with open("backend/data/atr_rule_specification.json", "r") as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                try:
-                    with open("whispr/backend/data/atr_rule_specification.json", "r") as f:
-                        return json.load(f)
-                except FileNotFoundError:
-                    raise FileNotFoundError("atr_rule_specification.json not found in any expected location")
+        return self._load_json(_SPEC_PATH, "atr_rule_specification.json")
     
     def _load_atr_levels(self) -> Dict[str, Any]:
         """Load ATR levels configuration."""
+        return self._load_json(_LEVELS_PATH, "atr_levels.json")
+    
+    @staticmethod
+    def _load_json(path: Optional[Path], filename: str) -> Dict[str, Any]:
+        """Read a resolved data file, failing clearly when it was not found at import."""
+        if path is None:
+            raise FileNotFoundError(f"{filename} not found in any expected location")
+        with open(path, "r") as f:
+            return json.load(f)
+    
+    async def _db(self):
+        """Return the cached DB connection, acquiring it on first use."""
+        if self._conn is None:
+            self._conn = await get_db()
+        return self._conn
+    
+    async def _fetchall(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read query, reconnecting once if the cached connection has gone away."""
+        conn = await self._db()
         try:
-            with open("data/atr_levels.json", "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            # Try alternative paths for different service contexts
-            try:
-                with open("backend/data/atr_levels.json", "r") as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                try:
-                    with open("whispr/backend/data/atr_levels.json", "r") as f:
-                        return json.load(f)
-                except FileNotFoundError:
-                    raise FileNotFoundError("atr_levels.json not found in any expected location")
+            return await conn.execute_fetchall(sql, params)
+        except (sqlite3.ProgrammingError, ValueError):
+            # Only a closed connection is retried - anything else is a real error
+            # (aiosqlite clears _connection when the connection is closed)
+            if conn._connection is not None:
+                raise
+            self._conn = None
+            # Drop the shared handle only if it is this same dead connection
+            if getattr(get_db, "conn", None) is conn:
+                await reset_db()
+            return await (await self._db()).execute_fetchall(sql, params)
     
     async def generate_atr_strategies(self):
         """Generate all ATR rules for all timeframes."""
-        conn = await get_db()
+        # Fetch existing ATR rule names once instead of probing per rule
+        rows = await self._fetchall("SELECT name FROM strategies WHERE strategy_type = 'atr_based'")
+        existing_names = frozenset(row[0] for row in rows)
+        conn = await self._db()
         
-        # First, register the ATR levels indicator if not exists
-        await self._register_atr_indicator()
+        # Register the ATR levels indicator if not exists
+        await self._register_atr_indicator(conn)
+        await self._ensure_name_index(conn)
         
-        total_strategies = 0
+        # Row building is pure CPU work - keep it off the event loop
+        loop = asyncio.get_running_loop()
+        new_rows, new_rules, counts, warnings = await loop.run_in_executor(None, self._build_all_rows, existing_names)
         
-        # Generate rules for each timeframe
-        for timeframe in self.specification["timeframes"]:
-            if timeframe not in self.atr_levels:
-                await log_event("warning", {"message": f"Timeframe {timeframe} not found in atr_levels.json"})
-                continue
-            
-            # Generate adjacent rules
-            adjacent_count = await self._generate_adjacent_rules(timeframe)
-            
-            # Generate multi-level rules  
-            multi_level_count = await self._generate_multi_level_rules(timeframe)
-            
+        # Accumulate the run's events and write them together at the end
+        events = [("warning", {"message": message}) for message in warnings]
+        
+        total_strategies = 0
+        for timeframe, adjacent_count, multi_level_count in counts:
             total_strategies += adjacent_count + multi_level_count
-            
-            await log_event("atr_strategies_generated", {
+            events.append(("atr_strategies_generated", {
                 "timeframe": timeframe,
                 "adjacent_strategies": adjacent_count,
                 "multi_level_strategies": multi_level_count
-            })
+            }))
+        
+        # Write every new rule in a single transaction
+        index_was_current = self._index_version == self._version
+        await self._insert_rows(new_rows)
+        if index_was_current and new_rules:
+            await self._extend_index(new_rules)
         
-        await log_event("atr_strategies_complete", {
+        events.append(("atr_strategies_complete", {
             "message": f"Generated {total_strategies} ATR strategies across all timeframes",
             "total_strategies": total_strategies
-        })
+        }))
+        await log_events(events)
         
         return total_strategies
     
-    async def _register_atr_indicator(self):
+    async def _insert_rows(self, rows: List[tuple]) -> int:
+        """Insert rule rows in one transaction."""
+        if not rows:
+            return 0
+        
+        try:
+            async with transaction() as conn:
+                cursor = await conn.executemany(INSERT_STRATEGY_SQL, rows)
+        finally:
+            self._version += 1  # invalidate the evaluation index
+        
+        # Rows ignored as duplicates are not counted
+        return cursor.rowcount
+    
+    async def _ensure_name_index(self, conn):
+        """Create the unique strategies(name) index once per process."""
+        if self._name_index_ready:
+            return
+        try:
+            async with write_lock():
+                await conn.execute(CREATE_NAME_INDEX_SQL)
+        except sqlite3.IntegrityError:
+            # Legacy duplicate names - the existing-name filter still prevents new ones
+            await log_event("warning", {"message": "strategies has duplicate names; unique name index not created"})
+        self._name_index_ready = True
+    
+    async def _register_atr_indicator(self, conn):
         """Register the ATR levels indicator."""
-        conn = await get_db()
-        await conn.execute(
-            "INSERT OR REPLACE INTO indicators (name, indicator_type, config) VALUES (?, ?, ?)",
-            ("atr_levels", "atr_levels", json.dumps({
-                "atr_length": 14,
-                "use_current_close": False
-            }))
-        )
+        async with write_lock():
+            await conn.execute(
+                "INSERT OR REPLACE INTO indicators (name, indicator_type, config) VALUES (?, ?, ?)",
+                ("atr_levels", "atr_levels", _dumps({
+                    "atr_length": 14,
+                    "use_current_close": False
+                }))
+            )
     
-    async def _generate_adjacent_rules(self, timeframe: str) -> int:
-        """Generate adjacent (one-step) ATR rules for a timeframe."""
-        conn = await get_db()
-        strategies_created = 0
+    def _build_all_rows(self, existing_names: FrozenSet[str]
+                        ) -> Tuple[List[tuple], Dict[str, ATRRule], List[Tuple[str, int, int]], List[str]]:
+        """Build insert rows for every timeframe without touching the DB or the event loop.
         
-        for tag, rule_spec in self.specification["adjacent_rules"].items():
-            key = rule_spec["key"]
-            
-            if key not in self.atr_levels[timeframe]:
-                await log_event("warning", {"message": f"ATR level {key} not found for timeframe {timeframe}"})
+        Returns the new rows, their parsed rules by name, (timeframe, adjacent,
+        multi-level) counts and any warning messages, which the caller logs.
+        """
+        rows: List[tuple] = []
+        rules: Dict[str, ATRRule] = {}
+        counts: List[Tuple[str, int, int]] = []
+        warnings: List[str] = []
+        
+        for timeframe in self.specification["timeframes"]:
+            if timeframe not in self.atr_levels:
+                warnings.append(f"Timeframe {timeframe} not found in atr_levels.json")
                 continue
             
-            level_value = self.atr_levels[timeframe][key]
-            
-            # Generate bullish rule
-            bull_name = f"ATR {timeframe.capitalize()} {tag} Bull"
-            bull_expression = f"price >= {level_value}"
-            bull_tags = json.dumps(["atr_level", timeframe, tag, "bull"])
-            
-            await self._create_atr_strategy(
-                bull_name, bull_expression, rule_spec["description"], 
-                bull_tags, rule_spec["probability"], rule_spec["priority"], 
-                "atr_level", timeframe, tag, "bull", level_value
-            )
-            strategies_created += 1
-            
-            # Generate bearish rule
-            bear_name = f"ATR {timeframe.capitalize()} {tag} Bear"
-            bear_expression = f"price <= -{level_value}"
-            bear_tags = json.dumps(["atr_level", timeframe, tag, "bear"])
-            
-            await self._create_atr_strategy(
-                bear_name, bear_expression, rule_spec["description"],
-                bear_tags, rule_spec["probability"], rule_spec["priority"],
-                "atr_level", timeframe, tag, "bear", -level_value
-            )
-            strategies_created += 1
+            adjacent_count = self._build_rules(timeframe, self._adj_specs, "atr_level", existing_names, rows, rules, warnings)
+            multi_level_count = self._build_rules(timeframe, self._multi_specs, "atr_multi", existing_names, rows, rules, warnings)
+            counts.append((timeframe, adjacent_count, multi_level_count))
         
-        return strategies_created
+        return rows, rules, counts, warnings
     
-    async def _generate_multi_level_rules(self, timeframe: str) -> int:
-        """Generate multi-level (skip-a-step) ATR rules for a timeframe."""
-        conn = await get_db()
+    def _build_rules(self, timeframe: str, specs: Tuple[tuple, ...], rule_type: str,
+                     existing_names: FrozenSet[str], rows: List[tuple], rules: Dict[str, ATRRule],
+                     warnings: List[str]) -> int:
+        """Append bull and bear rows for every precompiled spec on a timeframe."""
+        levels = self.atr_levels[timeframe]
+        title = self._tf_cap[timeframe]
+        tag_json = self._tag_json
+        expr_cache = self._expr_cache
         strategies_created = 0
         
-        for tag, rule_spec in self.specification["multi_level_rules"].items():
-            key = rule_spec["key"]
-            
-            if key not in self.atr_levels[timeframe]:
-                await log_event("warning", {"message": f"ATR level {key} not found for timeframe {timeframe}"})
+        for tag, key, description, probability, priority in specs:
+            if key not in levels:
+                warnings.append(f"ATR level {key} not found for timeframe {timeframe}")
                 continue
             
-            level_value = self.atr_levels[timeframe][key]
+            level_value = levels[key]
             
             # Generate bullish rule
-            bull_name = f"ATR {timeframe.capitalize()} {tag} Bull"
-            bull_expression = f"price >= {level_value}"
-            bull_tags = json.dumps(["atr_multi", timeframe, tag, "bull"])
-            
-            await self._create_atr_strategy(
-                bull_name, bull_expression, rule_spec["description"],
-                bull_tags, rule_spec["probability"], rule_spec["priority"],
-                "atr_multi", timeframe, tag, "bull", level_value
-            )
-            strategies_created += 1
+            name = f"ATR {title} {tag} Bull"
+            if name not in existing_names:
+                expression = expr_cache[level_value, ">="]
+                rows.append(self._build_row(
+                    name, expression, description,
+                    tag_json[rule_type, timeframe, tag, "bull"], probability, priority,
+                    rule_type, timeframe, tag, "bull", level_value
+                ))
+                rules[name] = ATRRule(expression, level_value, "bull", timeframe, rule_type, tag, probability)
             
             # Generate bearish rule
-            bear_name = f"ATR {timeframe.capitalize()} {tag} Bear"
-            bear_expression = f"price <= -{level_value}"
-            bear_tags = json.dumps(["atr_multi", timeframe, tag, "bear"])
-            
-            await self._create_atr_strategy(
-                bear_name, bear_expression, rule_spec["description"],
-                bear_tags, rule_spec["probability"], rule_spec["priority"],
-                "atr_multi", timeframe, tag, "bear", -level_value
-            )
-            strategies_created += 1
+            name = f"ATR {title} {tag} Bear"
+            if name not in existing_names:
+                expression = expr_cache[level_value, "<="]
+                rows.append(self._build_row(
+                    name, expression, description,
+                    tag_json[rule_type, timeframe, tag, "bear"], probability, priority,
+                    rule_type, timeframe, tag, "bear", -level_value
+                ))
+                rules[name] = ATRRule(expression, -level_value, "bear", timeframe, rule_type, tag, probability)
+            strategies_created += 2
         
         return strategies_created
     
-    async def _create_atr_strategy(self, name: str, expression: str, description: str, 
-                              tags: str, probability: float, priority: int,
-                              rule_type: str, timeframe: str, tag: str, side: str, level: float):
-        """Create a single ATR rule."""
-        conn = await get_db()
+    @staticmethod
+    def _build_row(name: str, expression: str, description: str,
+                   tags: str, probability: float, priority: int,
+                   rule_type: str, timeframe: str, tag: str, side: str, level: float) -> tuple:
+        """Build the strategies row for a single ATR rule."""
+        prompt_template = f"ATR {tag} {side.title()} rule triggered: {description}"
+        indicator_params = _indicator_params_json(timeframe, rule_type, tag, side, level, probability)
+        return (name, expression, prompt_template, tags, priority, "atr_based", "atr_levels", indicator_params)
+    
+    async def _refresh_index(self):
+        """Load every ATR strategy into the in-memory evaluation index."""
+        version = self._version
+        rows = await self._fetchall(
+            "SELECT id, strategy_expression, indicator_params FROM strategies WHERE strategy_type = 'atr_based'"
+        )
         
-        # Check if rule already exists
-        cursor = await conn.execute("SELECT id FROM strategies WHERE name = ?", (name,))
-        existing = await cursor.fetchone()
-        if existing:
-            return  # Rule already exists
+        index = {}
+        for strategy_id, expression, indicator_params_json in rows:
+            params = _loads(indicator_params_json)
+            index[strategy_id] = ATRRule(
+                expression,
+                params.get("level", 0),
+                params.get("side", "bull"),
+                params.get("timeframe"),
+                params.get("rule_type"),
+                params.get("tag"),
+                params.get("probability", 0.5)
+            )
         
-        # Create the rule
-        prompt_template = f"ATR {tag} {side.title()} rule triggered: {description}"
-        indicator_params = json.dumps({
-            "indicator": "atr_levels",
-            "timeframe": timeframe,
-            "rule_type": rule_type,
-            "tag": tag,
-            "side": side,
-            "level": level,
-            "probability": probability
-        })
+        self._set_index(index, version)
+    
+    async def _extend_index(self, rules: Dict[str, ATRRule]):
+        """Add freshly inserted rules to a current index without re-parsing their JSON."""
+        version = self._version
+        rows = await self._fetchall("SELECT id, name FROM strategies WHERE strategy_type = 'atr_based'")
         
-        await conn.execute(
-            """
-            INSERT INTO strategies (name, rule_expression, prompt_tpl, tags, priority, rule_type, indicator_ref, indicator_params)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (name, expression, prompt_template, tags, priority, "atr_based", "atr_levels", indicator_params)
-        )
+        index = dict(self._strategy_index)
+        for strategy_id, name in rows:
+            rule = rules.get(name)
+            if rule is not None:
+                index[strategy_id] = rule
+        
+        self._set_index(index, version)
+    
+    def _set_index(self, index: Dict[int, ATRRule], version: int):
+        """Install an evaluation index and its aligned NumPy columns."""
+        self._strategy_index = index
+        self._index_ids = np.fromiter(index, dtype=np.int64, count=len(index))
+        self._levels = np.fromiter((rule.level for rule in index.values()), dtype=np.float64, count=len(index))
+        self._bull = np.fromiter((rule.side == "bull" for rule in index.values()), dtype=bool, count=len(index))
+        self._positions = {strategy_id: column for column, strategy_id in enumerate(index)}
+        self._index_version = version
+    
+    def _triggered_matrix(self, prices: np.ndarray, columns) -> np.ndarray:
+        """Compare every price against the selected index columns in one broadcast."""
+        prices = np.asarray(prices, dtype=np.float64)[:, None]
+        levels = self._levels[columns][None, :]
+        return np.where(self._bull[columns], prices >= levels, prices <= levels)
+    
+    async def evaluate_batch(self, prices: np.ndarray, symbols: np.ndarray,
+                             strategy_ids: Optional[List[int]] = None) -> np.ndarray:
+        """Evaluate many prices against many ATR strategies at once.
+        
+        Returns a (len(prices), n_strategies) bool array whose columns follow
+        ``strategy_ids`` (or every indexed ATR strategy when omitted). A trigger
+        event is queued for the background event writer for each True cell.
+        """
+        if self._index_version != self._version:
+            await self._refresh_index()
+        
+        if strategy_ids is None:
+            ids = self._index_ids
+            columns = slice(None)
+        else:
+            ids = np.asarray(strategy_ids, dtype=np.int64)
+            columns = [self._positions[strategy_id] for strategy_id in strategy_ids]
+        
+        triggered = self._triggered_matrix(prices, columns)
+        
+        for row, column in zip(*np.nonzero(triggered)):
+            strategy_id = int(ids[column])
+            rule = self._strategy_index[strategy_id]
+            log_event_nowait("atr_strategy_trigger", {
+                "strategy_id": strategy_id,
+                "rule_expression": rule.expression,
+                "timeframe": rule.timeframe,
+                "rule_type": rule.rule_type,
+                "tag": rule.tag,
+                "side": rule.side,
+                "price": float(prices[row]),
+                "level": rule.level,
+                "symbol": str(symbols[row]),
+                "probability": rule.probability
+            })
+        
+        return triggered
     
     async def evaluate_atr_strategy(self, strategy_id: int, current_price: float, symbol: str) -> Dict[str, Any]:
         """Evaluate an ATR rule against current market data."""
-        conn = await get_db()
-        
-        # Get rule details
-        cursor = await conn.execute(
-            "SELECT rule_expression, indicator_params FROM strategies WHERE id = ?",
-            (strategy_id,)
-        )
-        rule = await cursor.fetchone()
-        if not rule:
-            return {"triggered": False, "error": "Rule not found"}
+        if self._index_version != self._version:
+            await self._refresh_index()
         
-        rule_expression, indicator_params_json = rule
-        indicator_params = json.loads(indicator_params_json)
+        rule = self._strategy_index.get(strategy_id)
+        if rule is None:
+            # The rule may have been written by another process since the last load,
+            # but a caller polling a bad id must not reload the table on every call
+            now = time.monotonic()
+            checked = self._missing_checked.get(strategy_id)
+            if checked is None or now - checked >= MISSING_RULE_REFRESH_SECONDS:
+                await self._refresh_index()
+                self._missing_checked.pop(strategy_id, None)
+                if len(self._missing_checked) >= MISSING_RULE_CACHE_SIZE:
+                    del self._missing_checked[next(iter(self._missing_checked))]
+                self._missing_checked[strategy_id] = now
+            rule = self._strategy_index.get(strategy_id)
+            if rule is None:
+                return {"triggered": False, "error": "Rule not found"}
+            self._missing_checked.pop(strategy_id, None)
         
-        # Evaluate the rule
+        # Evaluate the rule through the batched path
         try:
-            # Simple evaluation - in production you'd use the safe_eval function
-            # For now, we'll do a basic check
-            level = indicator_params.get("level", 0)
-            side = indicator_params.get("side", "bull")
-            
-            if side == "bull":
-                triggered = current_price >= level
-            else:  # bear
-                triggered = current_price <= level
-            
-            if triggered:
-                # Log the ATR rule trigger
-                await log_event("atr_strategy_trigger", {
-                    "strategy_id": strategy_id,
-                    "rule_expression": rule_expression,
-                    "timeframe": indicator_params.get("timeframe"),
-                    "rule_type": indicator_params.get("rule_type"),
-                    "tag": indicator_params.get("tag"),
-                    "side": side,
-                    "price": current_price,
-                    "level": level,
-                    "symbol": symbol,
-                    "probability": indicator_params.get("probability", 0.5)
-                })
+            triggered = await self.evaluate_batch([current_price], [symbol], [strategy_id])
+            triggered = bool(triggered[0, 0])
             
             return {
                 "triggered": triggered,
-                "rule_expression": rule_expression,
-                "timeframe": indicator_params.get("timeframe"),
-                "rule_type": indicator_params.get("rule_type"),
-                "tag": indicator_params.get("tag"),
-                "side": side,
+                "rule_expression": rule.expression,
+                "timeframe": rule.timeframe,
+                "rule_type": rule.rule_type,
+                "tag": rule.tag,
+                "side": rule.side,
                 "current_price": current_price,
-                "level": level,
-                "probability": indicator_params.get("probability", 0.5)
+                "level": rule.level,
+                "probability": rule.probability
             }
             
         except Exception as e:
             await log_event("error", {"message": f"ATR rule evaluation failed: {str(e)}"})
             return {"triggered": False, "error": f"Evaluation failed: {str(e)}"}
 
-# Global instance
-atr_strategy_generator = ATRStrategyGenerator() 
\ No newline at end of file
+@cache
+def get_atr_strategy_generator() -> Optional[ATRStrategyGenerator]:
+    """Return the shared generator, built on first use (None if its data files are missing)."""
+    try:
+        return ATRStrategyGenerator()
+    except FileNotFoundError:
+        return None 
\ No newline at end of file
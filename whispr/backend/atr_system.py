@@ -11,11 +11,15 @@ from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, AsyncGenerator
 from dataclasses import dataclass
 
+import numpy as np
+
 # Import our modular components
 from data_collector import SchwabDataCollector, MarketTick, OHLCCandle, get_data_collector
 from atr_calculator import ATRCalculator, ATRLevels
 from fixed_fib_level_strategy import FixedFibonacciLevelTracker, FibLevelHit
-from timeframe_aggregator import SPXTimeframeAggregator, OHLCBar
+from timeframe_aggregator import (
+    SPXTimeframeAggregator, OHLCBar, CANDLE_ROW_DTYPE, CANDLE_EPOCH_ROW_DTYPE, to_utc_datetime64
+)
 from database import (
     log_event, log_spx_tick, store_atr_levels, log_level_hit,
     start_golden_gate_sequence, complete_golden_gate_sequence,
@@ -309,7 +313,7 @@ class SPXATRSystem:
             
             # Get historical data
             cursor.execute("""
-                SELECT timestamp, open_price, high_price, low_price, close_price, volume
+                SELECT CAST(strftime('%s', timestamp) AS INTEGER), open_price, high_price, low_price, close_price, volume
                 FROM historical_candles 
                 WHERE timeframe = ?
                 ORDER BY timestamp ASC
@@ -325,38 +329,16 @@ class SPXATRSystem:
             
             logger.info(f"✅ Retrieved {len(results)} historical candles for {timeframe}")
             
-            # Convert to OHLCBar objects and feed directly to the aggregator cache
-            from dataclasses import dataclass
-            from datetime import datetime
-            from typing import List
+            # Load the rows as NumPy columns; SQLite already parsed timestamps to epoch seconds
+            bars = np.fromiter(results, dtype=CANDLE_EPOCH_ROW_DTYPE, count=len(results))
+            timestamps = bars['ts'].astype('datetime64[s]')
             
-            bars = []
-            for row in results:
-                timestamp_str, open_price, high_price, low_price, close_price, volume = row
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                
-                # Create OHLCBar object
-                bar = OHLCBar(
-                    timestamp=timestamp,
-                    open=open_price,
-                    high=high_price,
-                    low=low_price,
-                    close=close_price,
-                    volume=volume,
-                    timeframe=timeframe
-                )
-                bars.append(bar)
-            
-            # Special handling for scalp (needs aggregation from 1-min)
-            if timeframe == "scalp":
-                # Feed 1-min data for aggregation to 4h
-                for bar in bars:
-                    self.timeframe_aggregator.add_minute_bar(
-                        bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume
-                    )
-            else:
-                # Feed directly to the aggregator cache for this timeframe
-                self.timeframe_aggregator.aggregated_cache[timeframe] = bars
+            # Special handling for scalp (needs aggregation from 1-min): feed the
+            # minute buffer; other timeframes go directly to their aggregator cache
+            self.timeframe_aggregator.add_bars_bulk(
+                timestamps, bars['o'], bars['h'], bars['l'], bars['c'], bars['v'],
+                timeframe="1m" if timeframe == "scalp" else timeframe
+            )
             
             logger.info(f"📈 Bootstrap complete: {len(bars)} {timeframe} bars loaded")
             return len(bars) >= 14
@@ -365,32 +347,29 @@ class SPXATRSystem:
             logger.error(f"❌ Database bootstrap failed for {timeframe}: {e}")
             return False
     
+    async def _release_bootstrap(self):
+        """Release anything the bootstrap holds open; called when processing stops"""
+    
     async def _process_minute_data_for_4h(self, minute_data: list):
         """Process 1-minute data into 4-hour bars for scalp timeframe"""
-        from datetime import datetime
-        for row in minute_data:
-            timestamp_str, open_price, high_price, low_price, close_price, volume = row
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            
-            # Feed into aggregator as minute bars
-            self.timeframe_aggregator.add_minute_bar(
-                timestamp, open_price, high_price, low_price, close_price, volume
-            )
+        bars = np.fromiter(minute_data, dtype=CANDLE_ROW_DTYPE, count=len(minute_data))
+        
+        # Feed into aggregator as minute bars (timestamps parsed as one datetime64 column)
+        self.timeframe_aggregator.add_bars_bulk(
+            to_utc_datetime64(bars['ts']), bars['o'], bars['h'], bars['l'], bars['c'], bars['v']
+        )
     
     async def _process_historical_bars(self, historical_data: list, timeframe: str):
         """Process historical bars - convert all to minute bars for aggregation"""
-        from datetime import datetime
         logger.info(f"🔄 Processing {len(historical_data)} {timeframe} bars into minute format...")
         
-        for row in historical_data:
-            timestamp_str, open_price, high_price, low_price, close_price, volume = row
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            
-            # All historical data goes through add_minute_bar
-            # The aggregator will handle timeframe conversion automatically
-            self.timeframe_aggregator.add_minute_bar(
-                timestamp, open_price, high_price, low_price, close_price, volume
-            )
+        bars = np.fromiter(historical_data, dtype=CANDLE_ROW_DTYPE, count=len(historical_data))
+        
+        # All historical data goes through the minute buffer
+        # The aggregator will handle timeframe conversion automatically
+        self.timeframe_aggregator.add_bars_bulk(
+            to_utc_datetime64(bars['ts']), bars['o'], bars['h'], bars['l'], bars['c'], bars['v']
+        )
         
         logger.info(f"✅ Processed {len(historical_data)} historical bars for {timeframe}")
     
@@ -504,6 +483,7 @@ class SPXATRSystem:
             raise
         finally:
             self.state.system_status = "stopped"
+            await self._release_bootstrap()
     
     def get_current_levels(self, timeframe: Optional[str] = None) -> Dict[str, ATRLevels]:
         """Get current ATR levels for all timeframes or specific timeframe"""
@@ -5,15 +5,45 @@ Provides real-time monitoring of token health and authentication status
 """
 
 import asyncio
+import io
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 import logging
 
+import aiofiles
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps_indented(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    _loads = json.loads
+
+    def _dumps_indented(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_REPORT_SEP = "=" * 60
+
+def _parse_token_file(raw: bytes) -> Tuple[Dict[str, Any], str, float]:
+    """Parse the token file once into (token_data, expires_at ISO string, expires_at POSIX time)"""
+    token_data = _loads(raw)
+    expires_at = datetime.fromisoformat(token_data["expires_at"])
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return token_data, expires_at.isoformat(), expires_at.timestamp()
+
 class AuthMonitor:
     """Monitor authentication health and provide status reports"""
 
@@ -22,11 +52,39 @@ class AuthMonitor:
         self.token_file = Path("backend/.schwab_tokens.json")
         self.alert_file = Path("backend/AUTH_ALERT.txt")
         self.status_file = Path("backend/auth_status.json")
+        # String paths for the per-check stat calls
+        self._metrics_path_str = str(self.metrics_file)
+        self._token_path_str = str(self.token_file)
+        self._alert_path_str = str(self.alert_file)
+        # Parsed file contents keyed by path, reused while (mtime_ns, size) is unchanged
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+    @staticmethod
+    def _stat(path: str) -> Optional[os.stat_result]:
+        """Stat a file once, returning None if it does not exist"""
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
+    async def _read_cached(self, path: str, st: os.stat_result, parse: Callable[[bytes], Any]) -> Any:
+        """Read and parse a file, reusing the last result while its stat is unchanged"""
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        async with aiofiles.open(path, 'rb') as f:
+            parsed = parse(await f.read())
+        self._file_cache[path] = (key, parsed)
+        return parsed
 
     async def get_auth_health(self) -> Dict[str, Any]:
         """Get comprehensive authentication health status"""
+        # One clock read per check, shared by the timestamp and expiry math
+        now = datetime.now(timezone.utc)
         health = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now.isoformat(),
             "status": "unknown",
             "token_status": {},
             "metrics": {},
@@ -35,21 +93,18 @@ class AuthMonitor:
         }
 
         # Check token status
-        if self.token_file.exists():
+        token_st = self._stat(self._token_path_str)
+        if token_st is not None:
             try:
-                with open(self.token_file, 'r') as f:
-                    token_data = json.load(f)
-
-                expires_at = datetime.fromisoformat(token_data["expires_at"])
-                if expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                token_data, expires_at_iso, expires_at_ts = await self._read_cached(
+                    self._token_path_str, token_st, _parse_token_file
+                )
 
-                now = datetime.now(timezone.utc)
-                hours_until_expiry = (expires_at - now).total_seconds() / 3600
+                hours_until_expiry = (expires_at_ts - now.timestamp()) / 3600
 
                 health["token_status"] = {
                     "exists": True,
-                    "expires_at": expires_at.isoformat(),
+                    "expires_at": expires_at_iso,
                     "hours_until_expiry": round(hours_until_expiry, 2),
                     "refresh_count": token_data.get("refresh_count", 0),
                     "last_refresh": token_data.get("last_refresh")
@@ -70,7 +125,9 @@ class AuthMonitor:
                 else:
                     health["status"] = "healthy"
 
-            except Exception as e:
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # ValueError covers malformed JSON (both decoders) and bad timestamps,
+                # TypeError a non-object body or a null expires_at
                 health["status"] = "error"
                 health["alerts"].append(f"Failed to read token file: {e}")
         else:
@@ -79,10 +136,10 @@ class AuthMonitor:
             health["recommendations"].append("Run manual authentication")
 
         # Check metrics
-        if self.metrics_file.exists():
+        metrics_st = self._stat(self._metrics_path_str)
+        if metrics_st is not None:
             try:
-                with open(self.metrics_file, 'r') as f:
-                    metrics = json.load(f)
+                metrics = await self._read_cached(self._metrics_path_str, metrics_st, _loads)
 
                 health["metrics"] = {
                     "total_refreshes": metrics.get("total_refreshes", 0),
@@ -103,18 +160,20 @@ class AuthMonitor:
                 if metrics.get("uptime_percentage", 100) < 95:
                     health["alerts"].append(f"Low uptime: {metrics['uptime_percentage']:.1f}%")
 
-            except Exception as e:
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                # AttributeError covers a metrics body that is not a JSON object
                 logger.error(f"Failed to read metrics: {e}")
 
         # Check for alerts
-        if self.alert_file.exists():
+        # An empty alert file means no alert - skip opening it
+        alert_st = self._stat(self._alert_path_str)
+        if alert_st is not None and alert_st.st_size:
             try:
-                with open(self.alert_file, 'r') as f:
-                    alert_content = f.read()
+                alert_content = await self._read_cached(self._alert_path_str, alert_st, bytes.decode)
                 if alert_content:
                     health["alerts"].append("Manual authentication alert active!")
                     health["status"] = "critical"
-            except:
+            except (OSError, UnicodeDecodeError):
                 pass
 
         return health
@@ -123,67 +182,68 @@ class AuthMonitor:
         """Generate human-readable status report"""
         health = await self.get_auth_health()
 
-        report = []
-        report.append("=" * 60)
-        report.append("AUTHENTICATION STATUS REPORT")
-        report.append("=" * 60)
-        report.append(f"Generated: {health['timestamp']}")
-        report.append(f"Status: {health['status'].upper()}")
-        report.append("")
+        buf = io.StringIO()
+        w = buf.write
+        w(f"{_REPORT_SEP}\n")
+        w("AUTHENTICATION STATUS REPORT\n")
+        w(f"{_REPORT_SEP}\n")
+        w(f"Generated: {health['timestamp']}\n")
+        w(f"Status: {health['status'].upper()}\n")
+        w("\n")
 
         # Token status
         if health["token_status"]:
-            report.append("TOKEN STATUS:")
+            w("TOKEN STATUS:\n")
             ts = health["token_status"]
             if ts.get("exists"):
-                report.append(f"  Expires: {ts['expires_at']}")
-                report.append(f"  Hours remaining: {ts['hours_until_expiry']}")
-                report.append(f"  Refresh count: {ts['refresh_count']}")
+                w(f"  Expires: {ts['expires_at']}\n")
+                w(f"  Hours remaining: {ts['hours_until_expiry']}\n")
+                w(f"  Refresh count: {ts['refresh_count']}\n")
                 if ts.get("last_refresh"):
-                    report.append(f"  Last refresh: {ts['last_refresh']}")
+                    w(f"  Last refresh: {ts['last_refresh']}\n")
             else:
-                report.append("  No token found")
-        report.append("")
+                w("  No token found\n")
+        w("\n")
 
         # Metrics
         if health["metrics"]:
-            report.append("REFRESH METRICS:")
+            w("REFRESH METRICS:\n")
             m = health["metrics"]
-            report.append(f"  Total refreshes: {m['total_refreshes']}")
-            report.append(f"  Successful: {m['successful_refreshes']}")
-            report.append(f"  Failed: {m['failed_refreshes']}")
-            report.append(f"  Consecutive failures: {m['consecutive_failures']}")
-            report.append(f"  Uptime: {m['uptime_percentage']:.1f}%")
+            w(f"  Total refreshes: {m['total_refreshes']}\n")
+            w(f"  Successful: {m['successful_refreshes']}\n")
+            w(f"  Failed: {m['failed_refreshes']}\n")
+            w(f"  Consecutive failures: {m['consecutive_failures']}\n")
+            w(f"  Uptime: {m['uptime_percentage']:.1f}%\n")
             if m.get("last_failure_time"):
-                report.append(f"  Last failure: {m['last_failure_time']}")
+                w(f"  Last failure: {m['last_failure_time']}\n")
                 if m.get("last_failure_reason"):
-                    report.append(f"  Reason: {m['last_failure_reason'][:100]}")
-        report.append("")
+                    w(f"  Reason: {m['last_failure_reason'][:100]}\n")
+        w("\n")
 
         # Alerts
         if health["alerts"]:
-            report.append("ALERTS:")
+            w("ALERTS:\n")
             for alert in health["alerts"]:
-                report.append(f"  ⚠️  {alert}")
-            report.append("")
+                w(f"  ⚠️  {alert}\n")
+            w("\n")
 
         # Recommendations
         if health["recommendations"]:
-            report.append("RECOMMENDATIONS:")
+            w("RECOMMENDATIONS:\n")
             for rec in health["recommendations"]:
-                report.append(f"  → {rec}")
-            report.append("")
+                w(f"  → {rec}\n")
+            w("\n")
 
-        report.append("=" * 60)
+        w(_REPORT_SEP)
 
-        return "\n".join(report)
+        return buf.getvalue()
 
     async def save_status(self):
         """Save current status to file"""
         try:
             health = await self.get_auth_health()
-            with open(self.status_file, 'w') as f:
-                json.dump(health, f, indent=2)
+            async with aiofiles.open(self.status_file, 'wb') as f:
+                await f.write(_dumps_indented(health))
             logger.info("Status saved to auth_status.json")
         except Exception as e:
             logger.error(f"Failed to save status: {e}")
@@ -192,6 +252,10 @@ class AuthMonitor:
         """Continuous monitoring loop"""
         logger.info("Starting authentication monitor")
 
+        # Schedule ticks on the loop's monotonic clock so work time doesn't add drift
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
         while True:
             try:
                 health = await self.get_auth_health()
@@ -207,11 +271,15 @@ class AuthMonitor:
                 # Save status
                 await self.save_status()
 
-                await asyncio.sleep(interval_seconds)
-
             except Exception as e:
                 logger.error(f"Monitor error: {e}")
-                await asyncio.sleep(interval_seconds)
+
+            next_tick += interval_seconds
+            now = loop.time()
+            if next_tick < now:
+                # A tick overran the interval - skip the missed ticks rather than bursting
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
 
 
 async def main():
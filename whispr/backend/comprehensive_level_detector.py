@@ -4,22 +4,94 @@ Comprehensive ATR Level Detection System
 Detects all 28 ATR levels across all timeframes in real-time
 """
 import asyncio
+import io
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
 import json
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to the NumPy kernels
+    njit = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Rules used by format_level_display
+_SEP = '=' * 70
+_HSEP = '─' * 70
+_MARK_1ATR = '=' * 10
+_MARK_2ATR = '=' * 20
+
+
+def _calc_levels(pdc, atr_value, ratios, pdc_idx):
+    """Level values PDC + ATR * ratio, with the PDC slot pinned to PDC exactly."""
+    values = pdc + atr_value * ratios
+    values[pdc_idx] = pdc
+    return values
+
+
+def _cross_directions(previous_price, current_price, values, crossable):
+    """Per-level cross direction: 1 crossed up, -1 crossed down, 0 untouched."""
+    up = crossable & (previous_price <= values) & (values < current_price)
+    down = crossable & (previous_price >= values) & (values > current_price)
+    return up.astype(np.int8) - down.astype(np.int8)
+
+
+def _jit(signature, func):
+    """Compile eagerly with an on-disk cache, so the JIT cost is paid once, not per process.
+
+    This module is imported both as ``comprehensive_level_detector`` and as
+    ``backend.comprehensive_level_detector``; a cache written under the other
+    name cannot be loaded, so fall back to compiling in memory.
+    """
+    try:
+        return njit(signature, cache=True)(func)
+    except ImportError:
+        return njit(signature)(func)
+
+
+if njit is not None:
+    # No fastmath: contracting PDC + ATR * ratio into an FMA would move level values.
+    _calc_levels = _jit("float64[::1](float64, float64, float64[::1], int64)", _calc_levels)
+    _cross_directions = _jit("int8[::1](float64, float64, float64[::1], boolean[::1])", _cross_directions)
+
+@dataclass(slots=True, frozen=True)
 class ATRLevel:
-    """Represents a single ATR level"""
+    """Represents a single ATR level (immutable)"""
     name: str
     fib_ratio: float  # Percentage from PDC (0% = PDC)
     value: float
     direction: str  # 'upper', 'lower', or 'neutral'
 
+class ATRLevelMap(Mapping):
+    """Read-only name -> ATRLevel view over a cached level array.
+
+    ATRLevel objects are only built when a level is actually looked up.
+    """
+
+    __slots__ = ('_cache',)
+
+    def __init__(self, cache: Dict):
+        self._cache = cache
+
+    @property
+    def cache(self) -> Dict:
+        """The levels_cache entry this view reads from."""
+        return self._cache
+
+    def __getitem__(self, name: str) -> ATRLevel:
+        return ComprehensiveLevelCalculator._atr_level(self._cache, ComprehensiveLevelCalculator._INDEX[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ComprehensiveLevelCalculator._NAMES)
+
+    def __len__(self) -> int:
+        return len(ComprehensiveLevelCalculator._NAMES)
+
 class ComprehensiveLevelCalculator:
     """Calculate all 28 ATR levels for any timeframe"""
 
@@ -59,127 +131,169 @@ class ComprehensiveLevelCalculator:
         ("beyond_minus2atr", -2.001, "lower"),  # Tracking beyond -2 ATR
     ]
 
+    # Column views of LEVEL_DEFINITIONS, built once for the vectorized level math
+    _NAMES = tuple(name for name, _, _ in LEVEL_DEFINITIONS)
+    _RATIOS = np.fromiter((ratio for _, ratio, _ in LEVEL_DEFINITIONS), dtype=np.float64)
+    _DIRS = tuple(direction for _, _, direction in LEVEL_DEFINITIONS)
+    _INDEX = {name: i for i, name in enumerate(_NAMES)}
+    _PDC_IDX = _INDEX["PDC"]
+    BEYOND_LEVELS = frozenset(name for name in _NAMES if 'beyond' in name)  # tracking-only levels
+    _BEYOND_MASK = np.fromiter(map(BEYOND_LEVELS.__contains__, _NAMES), dtype=bool, count=len(_NAMES))
+    _CROSSABLE = ~_BEYOND_MASK
+    _CROSSABLE_IDX = np.flatnonzero(_CROSSABLE)
+
     def __init__(self):
         self.levels_cache = {}
         self.last_hit_levels = {}  # Track last hit level per timeframe
 
-    def calculate_all_levels(self, pdc: float, atr_value: float, timeframe: str) -> Dict[str, ATRLevel]:
+    def calculate_all_levels(self, pdc: float, atr_value: float, timeframe: str) -> Mapping[str, ATRLevel]:
         """
         Calculate all 28 ATR levels
         PDC is the 0% reference point
         """
-        levels = {}
+        # Calculate every level value at once: PDC ± (ATR * fib_ratio)
+        values = _calc_levels(pdc, atr_value, self._RATIOS, self._PDC_IDX)
+        return self._store_levels(timeframe, pdc, atr_value, values,
+                                  datetime.now(timezone.utc).isoformat())
 
-        for name, fib_ratio, direction in self.LEVEL_DEFINITIONS:
-            if name == "PDC":
-                value = pdc
-            else:
-                # Calculate level value: PDC ± (ATR * fib_ratio)
-                value = pdc + (atr_value * fib_ratio)
-
-            levels[name] = ATRLevel(
-                name=name,
-                fib_ratio=fib_ratio,
-                value=value,
-                direction=direction
-            )
-
-        # Cache the calculated levels
-        self.levels_cache[timeframe] = {
+    def calculate_all_levels_batch(self, pdcs: np.ndarray, atrs: np.ndarray,
+                                   timeframes: List[str]) -> Dict[str, Mapping[str, ATRLevel]]:
+        """
+        Calculate all 28 ATR levels for several timeframes in one pass
+        Row i uses pdcs[i] and atrs[i] and is cached under timeframes[i]
+        """
+        pdcs = np.asarray(pdcs, dtype=np.float64)
+        atrs = np.asarray(atrs, dtype=np.float64)
+        if not (len(pdcs) == len(atrs) == len(timeframes)):
+            raise ValueError("pdcs, atrs and timeframes must have the same length")
+
+        # One M x 28 matrix instead of M separate level calculations
+        values = pdcs[:, None] + atrs[:, None] * self._RATIOS[None, :]
+        values[:, self._PDC_IDX] = pdcs
+
+        calculated_at = datetime.now(timezone.utc).isoformat()
+        return {
+            timeframe: self._store_levels(timeframe, pdc, atr_value, row, calculated_at)
+            for timeframe, pdc, atr_value, row in zip(timeframes, pdcs.tolist(), atrs.tolist(), values)
+        }
+
+    def _store_levels(self, timeframe: str, pdc: float, atr_value: float,
+                      values: np.ndarray, calculated_at: str) -> Mapping[str, ATRLevel]:
+        """Cache one timeframe's level values and return its name -> ATRLevel view"""
+        # Sort the non-beyond levels once (stable, so ties keep definition order)
+        # so nearest-level lookups are binary searches and display needs no sort
+        crossable = self._CROSSABLE_IDX
+        asc_idx = crossable[np.argsort(values[crossable], kind='stable')]
+        desc_idx = crossable[np.argsort(-values[crossable], kind='stable')]
+
+        # Cache the raw arrays; ATRLevel objects are built on demand
+        cache = {
             'pdc': pdc,
             'atr': atr_value,
-            'levels': levels,
-            'calculated_at': datetime.now(timezone.utc).isoformat()
+            'values': values,
+            'ratios': self._RATIOS,
+            'names': self._NAMES,
+            'dirs': self._DIRS,
+            'asc_idx': asc_idx,
+            'asc_values': values[asc_idx],
+            'desc_idx': desc_idx,
+            'neg_desc_values': -values[desc_idx],
+            'upper_2atr': pdc + (2 * atr_value),
+            'lower_2atr': pdc - (2 * atr_value),
+            'calculated_at': calculated_at
         }
+        cache['levels'] = ATRLevelMap(cache)
+        self.levels_cache[timeframe] = cache
 
-        return levels
+        return cache['levels']
+
+    @classmethod
+    def _atr_level(cls, cache: Dict, i: int) -> ATRLevel:
+        """Materialize the i-th cached level as an ATRLevel."""
+        return ATRLevel(
+            name=cls._NAMES[i],
+            fib_ratio=cls.LEVEL_DEFINITIONS[i][1],
+            value=float(cache['values'][i]),
+            direction=cls._DIRS[i]
+        )
 
     def detect_level_crosses(self, current_price: float, previous_price: float,
-                           levels: Dict[str, ATRLevel], timeframe: str) -> List[Dict]:
+                           levels: ATRLevelMap, timeframe: str) -> List[Dict]:
         """
         Detect which levels were crossed between previous and current price
         Returns list of crossed levels with details
         """
         crossed = []
+        cache = levels.cache
+        names = cache['names']
+        ratios = cache['ratios']
+        values = cache['values']
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        # Compare against every level at once; beyond tracking levels are masked out
+        directions = _cross_directions(previous_price, current_price, values, self._CROSSABLE)
 
-        for name, level in levels.items():
-            # Skip beyond tracking levels for crossing detection
-            if 'beyond' in name:
-                continue
-
-            # Check if price crossed this level
-            if previous_price <= level.value < current_price:
-                # Crossed upward through level
-                crossed.append({
-                    'timeframe': timeframe,
-                    'level_name': name,
-                    'level_value': level.value,
-                    'cross_direction': 'up',
-                    'fib_ratio': level.fib_ratio,
-                    'price_at_cross': current_price,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                })
-            elif previous_price >= level.value > current_price:
-                # Crossed downward through level
-                crossed.append({
-                    'timeframe': timeframe,
-                    'level_name': name,
-                    'level_value': level.value,
-                    'cross_direction': 'down',
-                    'fib_ratio': level.fib_ratio,
-                    'price_at_cross': current_price,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                })
+        for i in np.flatnonzero(directions).tolist():
+            crossed.append({
+                'timeframe': timeframe,
+                'level_name': names[i],
+                'level_value': float(values[i]),
+                'cross_direction': 'up' if directions[i] > 0 else 'down',
+                'fib_ratio': float(ratios[i]),
+                'price_at_cross': current_price,
+                'timestamp': timestamp
+            })
 
         # Check if price is beyond ±2 ATR
-        pdc = self.levels_cache[timeframe]['pdc']
-        atr = self.levels_cache[timeframe]['atr']
+        pdc = cache['pdc']
+        atr = cache['atr']
+        upper_2atr = cache['upper_2atr']
+        lower_2atr = cache['lower_2atr']
 
-        if current_price > pdc + (2 * atr):
+        if current_price > upper_2atr:
             crossed.append({
                 'timeframe': timeframe,
                 'level_name': 'beyond_2atr',
-                'level_value': pdc + (2 * atr),
+                'level_value': upper_2atr,
                 'cross_direction': 'beyond_upper',
                 'fib_ratio': (current_price - pdc) / atr,  # Show how many ATRs away
                 'price_at_cross': current_price,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': timestamp
             })
-        elif current_price < pdc - (2 * atr):
+        elif current_price < lower_2atr:
             crossed.append({
                 'timeframe': timeframe,
                 'level_name': 'beyond_minus2atr',
-                'level_value': pdc - (2 * atr),
+                'level_value': lower_2atr,
                 'cross_direction': 'beyond_lower',
                 'fib_ratio': (current_price - pdc) / atr,  # Show how many ATRs away (negative)
                 'price_at_cross': current_price,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': timestamp
             })
 
         return crossed
 
-    def find_nearest_levels(self, current_price: float, levels: Dict[str, ATRLevel],
+    def _nearest_indices(self, cache: Dict, current_price: float,
+                         count: int) -> Tuple[List[int], List[int]]:
+        """Indices of the nearest non-beyond levels above and below a price"""
+        # Binary search the presorted levels: first value > price ascending,
+        # first value < price descending
+        start = int(np.searchsorted(cache['asc_values'], current_price, side='right'))
+        above = cache['asc_idx'][start:start + count].tolist()
+        start = int(np.searchsorted(cache['neg_desc_values'], -current_price, side='right'))
+        below = cache['desc_idx'][start:start + count].tolist()
+
+        return above, below
+
+    def find_nearest_levels(self, current_price: float, levels: ATRLevelMap,
                            count: int = 3) -> Tuple[List[ATRLevel], List[ATRLevel]]:
         """
         Find the nearest levels above and below current price
         """
-        above = []
-        below = []
-
-        for name, level in levels.items():
-            if 'beyond' in name:
-                continue
-
-            if level.value > current_price:
-                above.append(level)
-            elif level.value < current_price:
-                below.append(level)
-
-        # Sort and get nearest
-        above.sort(key=lambda x: x.value)
-        below.sort(key=lambda x: x.value, reverse=True)
-
-        return above[:count], below[:count]
+        cache = levels.cache
+        above, below = self._nearest_indices(cache, current_price, count)
+        return ([self._atr_level(cache, i) for i in above],
+                [self._atr_level(cache, i) for i in below])
 
     def get_price_position(self, current_price: float, timeframe: str) -> Dict:
         """
@@ -191,7 +305,8 @@ class ComprehensiveLevelCalculator:
         cache = self.levels_cache[timeframe]
         pdc = cache['pdc']
         atr = cache['atr']
-        levels = cache['levels']
+        names = cache['names']
+        values = cache['values']
 
         # Calculate position metrics
         distance_from_pdc = current_price - pdc
@@ -199,7 +314,7 @@ class ComprehensiveLevelCalculator:
         percentage_from_pdc = (distance_from_pdc / pdc) * 100 if pdc > 0 else 0
 
         # Find nearest levels
-        above_levels, below_levels = self.find_nearest_levels(current_price, levels, count=3)
+        above_idx, below_idx = self._nearest_indices(cache, current_price, count=3)
 
         # Determine current zone
         current_zone = "neutral"
@@ -222,13 +337,13 @@ class ComprehensiveLevelCalculator:
             'pdc': pdc,
             'atr': atr,
             'distance_from_pdc': distance_from_pdc,
-            'atr_multiple': round(atr_multiple, 3),
-            'percentage_from_pdc': round(percentage_from_pdc, 2),
+            'atr_multiple': atr_multiple,
+            'percentage_from_pdc': percentage_from_pdc,
             'current_zone': current_zone,
-            'nearest_above': [{'name': l.name, 'value': l.value, 'distance': l.value - current_price}
-                             for l in above_levels],
-            'nearest_below': [{'name': l.name, 'value': l.value, 'distance': current_price - l.value}
-                             for l in below_levels],
+            'nearest_above': [{'name': names[i], 'value': float(values[i]), 'distance': float(values[i]) - current_price}
+                             for i in above_idx],
+            'nearest_below': [{'name': names[i], 'value': float(values[i]), 'distance': current_price - float(values[i])}
+                             for i in below_idx],
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
 
@@ -242,46 +357,48 @@ class ComprehensiveLevelCalculator:
         cache = self.levels_cache[timeframe]
         pdc = cache['pdc']
         atr = cache['atr']
-        levels = cache['levels']
-
-        lines = []
-        lines.append(f"\n{'='*70}")
-        lines.append(f"ATR LEVELS for {timeframe} | PDC: ${pdc:.2f} | ATR: ${atr:.2f}")
-        lines.append(f"Current Price: ${current_price:.2f}")
-        lines.append(f"{'='*70}")
-
-        # Sort levels by value descending
-        sorted_levels = sorted(levels.values(), key=lambda x: x.value, reverse=True)
-
-        for level in sorted_levels:
-            if 'beyond' in level.name:
-                continue
+        names = cache['names']
+        ratios = cache['ratios'].tolist()
+        values = cache['values'].tolist()
+
+        buf = io.StringIO()
+        w = buf.write
+        w(f"\n{_SEP}\n")
+        w(f"ATR LEVELS for {timeframe} | PDC: ${pdc:.2f} | ATR: ${atr:.2f}\n")
+        w(f"Current Price: ${current_price:.2f}\n")
+        w(f"{_SEP}\n")
+
+        # Levels by value descending (presorted, beyond levels already excluded)
+        for i in cache['desc_idx'].tolist():
+            name = names[i]
+            value = values[i]
+            fib_ratio = ratios[i]
 
             # Determine position indicator
-            if abs(current_price - level.value) < 0.50:
+            if abs(current_price - value) < 0.50:
                 indicator = " <<<--- CURRENT PRICE HERE"
-            elif current_price > level.value:
+            elif current_price > value:
                 indicator = " ✓"  # Price is above this level
             else:
                 indicator = ""  # Price is below this level
 
             # Special formatting for key levels
-            if level.name == "PDC":
-                lines.append(f"{'─'*70}")
-                lines.append(f"  {level.name:15} | ${level.value:8.2f} | {level.fib_ratio:+6.1%} | *** ZERO REFERENCE ***{indicator}")
-                lines.append(f"{'─'*70}")
-            elif abs(level.fib_ratio) == 1.0:
-                lines.append(f"  {level.name:15} | ${level.value:8.2f} | {level.fib_ratio:+6.1%} | {'='*10}{indicator}")
-            elif abs(level.fib_ratio) == 2.0:
-                lines.append(f"  {level.name:15} | ${level.value:8.2f} | {level.fib_ratio:+6.1%} | {'='*20}{indicator}")
+            if name == "PDC":
+                w(f"{_HSEP}\n")
+                w(f"  {name:15} | ${value:8.2f} | {fib_ratio:+6.1%} | *** ZERO REFERENCE ***{indicator}\n")
+                w(f"{_HSEP}\n")
+            elif abs(fib_ratio) == 1.0:
+                w(f"  {name:15} | ${value:8.2f} | {fib_ratio:+6.1%} | {_MARK_1ATR}{indicator}\n")
+            elif abs(fib_ratio) == 2.0:
+                w(f"  {name:15} | ${value:8.2f} | {fib_ratio:+6.1%} | {_MARK_2ATR}{indicator}\n")
             else:
-                lines.append(f"  {level.name:15} | ${level.value:8.2f} | {level.fib_ratio:+6.1%}{indicator}")
+                w(f"  {name:15} | ${value:8.2f} | {fib_ratio:+6.1%}{indicator}\n")
 
         # Add position summary
         distance = current_price - pdc
         atr_multiple = distance / atr if atr > 0 else 0
-        lines.append(f"\n{'─'*70}")
-        lines.append(f"Position: {atr_multiple:+.3f} ATR from PDC (${distance:+.2f})")
-        lines.append(f"{'='*70}\n")
+        w(f"\n{_HSEP}\n")
+        w(f"Position: {atr_multiple:+.3f} ATR from PDC (${distance:+.2f})\n")
+        w(f"{_SEP}\n")
 
-        return '\n'.join(lines)
\ No newline at end of file
+        return buf.getvalue()
\ No newline at end of file
@@ -3,10 +3,162 @@ Hourly Conviction Arrow Strategy Implementation
 Consumes data from existing Saty Pivot Ribbon Pro indicator.
 """
 
+import asyncio
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any
-from database import get_db, log_event
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from database import (
+    execute_nowait, flush_writes, get_db, log_event, log_event_nowait, read_fetchall, read_iter, transaction,
+    write_lock,
+)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Outcome tracking table and the indexes its hot queries rely on
+OUTCOMES_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS conviction_arrow_outcomes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    strategy_id INTEGER NOT NULL,
+    arrow_time DATETIME NOT NULL,
+    direction TEXT NOT NULL,
+    evaluation_due DATETIME NOT NULL,
+    evaluated BOOLEAN DEFAULT 0,
+    success BOOLEAN DEFAULT NULL,
+    evaluation_notes TEXT,
+    evaluation_time DATETIME,
+    FOREIGN KEY (strategy_id) REFERENCES strategies(id)
+);
+-- Pending scan: covers every column check_pending_evaluations reads
+CREATE INDEX IF NOT EXISTS ix_cao_pending
+    ON conviction_arrow_outcomes(evaluated, evaluation_due, strategy_id, arrow_time, direction);
+-- Auto-fail of opposite arrows
+CREATE INDEX IF NOT EXISTS ix_cao_strategy_dir
+    ON conviction_arrow_outcomes(strategy_id, direction, evaluated);
+-- Most recent arrows for the statistics view
+CREATE INDEX IF NOT EXISTS ix_cao_arrow_time
+    ON conviction_arrow_outcomes(arrow_time DESC);
+
+-- Running totals for get_arrow_statistics, kept current by triggers so the
+-- statistics read is one row instead of a scan of every outcome
+CREATE TABLE IF NOT EXISTS conviction_arrow_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    pending INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS cao_stats_ins AFTER INSERT ON conviction_arrow_outcomes BEGIN
+    UPDATE conviction_arrow_stats SET
+        total = total + 1,
+        successes = successes + (NEW.evaluated IS 1 AND NEW.success IS 1),
+        failures = failures + (NEW.evaluated IS 1 AND NEW.success IS 0),
+        pending = pending + (NEW.evaluated IS 0);
+END;
+-- Swap the old row's contribution for the new one, so re-recording an
+-- already evaluated outcome doesn't count it twice
+CREATE TRIGGER IF NOT EXISTS cao_stats_upd AFTER UPDATE OF evaluated, success ON conviction_arrow_outcomes BEGIN
+    UPDATE conviction_arrow_stats SET
+        successes = successes - (OLD.evaluated IS 1 AND OLD.success IS 1) + (NEW.evaluated IS 1 AND NEW.success IS 1),
+        failures = failures - (OLD.evaluated IS 1 AND OLD.success IS 0) + (NEW.evaluated IS 1 AND NEW.success IS 0),
+        pending = pending - (OLD.evaluated IS 0) + (NEW.evaluated IS 0);
+END;
+CREATE TRIGGER IF NOT EXISTS cao_stats_del AFTER DELETE ON conviction_arrow_outcomes BEGIN
+    UPDATE conviction_arrow_stats SET
+        total = total - 1,
+        successes = successes - (OLD.evaluated IS 1 AND OLD.success IS 1),
+        failures = failures - (OLD.evaluated IS 1 AND OLD.success IS 0),
+        pending = pending - (OLD.evaluated IS 0);
+END;
+-- Seed from existing outcomes; runs after the triggers exist, so rows written
+-- by other connections are counted exactly once
+INSERT OR IGNORE INTO conviction_arrow_stats (id, total, successes, failures, pending)
+SELECT 1, COUNT(*),
+    COUNT(CASE WHEN evaluated = 1 AND success = 1 THEN 1 END),
+    COUNT(CASE WHEN evaluated = 1 AND success = 0 THEN 1 END),
+    COUNT(CASE WHEN evaluated = 0 THEN 1 END)
+FROM conviction_arrow_outcomes;
+"""
+_schema_ready = False
+_schema_lock = asyncio.Lock()
+
+async def _ensure_schema():
+    """Create the outcomes table and indexes once per process."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    async with _schema_lock:
+        if not _schema_ready:
+            conn = await get_db()
+            # executescript COMMITs any open transaction first, so it must not
+            # run while another task is inside transaction()
+            async with write_lock():
+                await conn.executescript(OUTCOMES_SCHEMA_SQL)
+                # Tables created before record_arrow_outcome stored evaluation_time
+                columns = await conn.execute_fetchall("PRAGMA table_info(conviction_arrow_outcomes)")
+                if "evaluation_time" not in {column[1] for column in columns}:
+                    await conn.execute("ALTER TABLE conviction_arrow_outcomes ADD COLUMN evaluation_time DATETIME")
+            _schema_ready = True
+
+# Strategy row metadata - literals, so serialized once at import
+_TAGS_JSON = json.dumps(["conviction_arrow", "1h", "ema_cross"])
+_INDICATOR_PARAMS_JSON = json.dumps({
+    "timeframe": "1h",
+    "ema_fast": 13,
+    "ema_slow": 48,
+    "evaluation_days": 3,  # Check result after 2-3 trading days
+    "indicator_source": "pivot_ribbon_pro"  # References original ThinkScript
+})
+
+# SQL used per arrow / per check, built once at import
+_SQL_STRATEGY_PARAMS = "SELECT id, indicator_params FROM strategies WHERE id = ?"
+# Evaluation is due 3 days out (simplified - not counted in trading days);
+# computed by SQLite so it shares arrow_time's clock and format
+_SQL_INSERT_OUTCOME = """
+    INSERT INTO conviction_arrow_outcomes
+    (strategy_id, arrow_time, direction, evaluation_due)
+    VALUES (?, datetime('now'), ?, datetime('now', '+3 days'))
+    RETURNING id, evaluation_due
+"""
+_SQL_AUTO_FAIL = """
+    UPDATE conviction_arrow_outcomes
+    SET evaluated = 1, success = 0, evaluation_notes = 'Auto-failed due to opposite arrow'
+    WHERE strategy_id = ? AND direction = ? AND evaluated = 0
+"""
+_SQL_RECORD_OUTCOME = """
+    UPDATE conviction_arrow_outcomes
+    SET evaluated = 1, success = ?, evaluation_notes = ?, 
+        evaluation_time = datetime('now')
+    WHERE id = ?
+"""
+_SQL_PENDING = """
+    SELECT id, strategy_id, arrow_time, direction, evaluation_due
+    FROM conviction_arrow_outcomes
+    WHERE evaluated = 0 AND evaluation_due <= datetime('now')
+"""
+_SQL_STATS = "SELECT total, successes, failures, pending FROM conviction_arrow_stats WHERE id = 1"
+# Recent arrows, already in their reported form: booleans as 0/1 and
+# success NULL until evaluated
+RECENT_SIGNAL_FIELDS = ("direction", "time", "evaluated", "success", "notes")
+_SQL_RECENT = """
+    SELECT direction, arrow_time, evaluated != 0,
+        CASE WHEN evaluated != 0 THEN success != 0 END, evaluation_notes
+    FROM conviction_arrow_outcomes
+    ORDER BY arrow_time DESC LIMIT 5
+"""
+# Next future deadline and the seconds until it (both NULL if none)
+_SQL_NEXT_DUE = """
+    SELECT MIN(evaluation_due), (julianday(MIN(evaluation_due)) - julianday('now')) * 86400.0
+    FROM conviction_arrow_outcomes
+    WHERE evaluated = 0 AND evaluation_due > datetime('now')
+"""
 
 class ConvictionArrowStrategy:
     """Monitors and tracks hourly conviction arrow signals from existing Pivot Ribbon indicator."""
@@ -14,72 +166,67 @@ class ConvictionArrowStrategy:
     def __init__(self):
         self.timeframe = "1h"
         self.strategy_type = "conviction_arrow"
+        # indicator_params by strategy id; strategies rows don't change at runtime
+        self._params_cache: Dict[int, Dict[str, Any]] = {}
+        # Strategy count from the first existence check (or our own insert)
+        self._exists_checked = False
+        self._existing_count = 0
+        # Earliest future evaluation_due known to watch_pending_evaluations;
+        # the event wakes it when a new arrow is due sooner
+        self._next_due: Optional[str] = None
+        self._due_changed = asyncio.Event()
         
     async def generate_conviction_arrow_strategy(self):
         """Generate the hourly conviction arrow strategy."""
-        conn = await get_db()
+        if self._exists_checked:
+            return self._existing_count
+        
+        await _ensure_schema()
         
         # Check if strategy already exists
-        cursor = await conn.execute(
+        (existing_count,) = await read_fetchall(
             "SELECT COUNT(*) FROM strategies WHERE strategy_type = ? AND timeframe = ?",
             (self.strategy_type, self.timeframe)
         )
-        existing_count = await cursor.fetchone()
         
         if existing_count[0] > 0:
+            self._exists_checked = True
+            self._existing_count = existing_count[0]
             await log_event("conviction_arrow_strategy_exists", {
                 "message": f"Conviction arrow strategy already exists ({existing_count[0]} found)"
             })
             return existing_count[0]
         
         # Create the strategy
+        conn = await get_db()
         strategy_name = "Hourly Conviction Arrow"
         strategy_expression = "HOURLY_CONVICTION_ARROW"
         description = "Monitor conviction arrows (13 EMA vs 48 EMA crosses) on 1H timeframe"
-        tags = json.dumps(["conviction_arrow", "1h", "ema_cross"])
         priority = 7  # High priority for conviction signals
         
-        indicator_params = json.dumps({
-            "timeframe": self.timeframe,
-            "ema_fast": 13,
-            "ema_slow": 48,
-            "evaluation_days": 3,  # Check result after 2-3 trading days
-            "indicator_source": "pivot_ribbon_pro"  # References original ThinkScript
-        })
-        
-        await conn.execute(
-            """
-            INSERT INTO strategies (
-                name, strategy_expression, prompt_tpl, tags, priority,
-                strategy_type, indicator_ref, indicator_params
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                strategy_name,
-                strategy_expression,
-                "New conviction arrow detected on 1H timeframe. Direction: {direction}. Will evaluate outcome in 2-3 trading days.",
-                tags,
-                priority,
-                self.strategy_type,
-                "pivot_ribbon",
-                indicator_params
+        async with write_lock():
+            await conn.execute(
+                """
+                INSERT INTO strategies (
+                    name, strategy_expression, prompt_tpl, tags, priority,
+                    strategy_type, indicator_ref, indicator_params
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    strategy_name,
+                    strategy_expression,
+                    "New conviction arrow detected on 1H timeframe. Direction: {direction}. Will evaluate outcome in 2-3 trading days.",
+                    _TAGS_JSON,
+                    priority,
+                    self.strategy_type,
+                    "pivot_ribbon",
+                    _INDICATOR_PARAMS_JSON
+                )
             )
-        )
         
-        # Create table for tracking arrow outcomes if it doesn't exist
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS conviction_arrow_outcomes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                strategy_id INTEGER NOT NULL,
-                arrow_time DATETIME NOT NULL,
-                direction TEXT NOT NULL,
-                evaluation_due DATETIME NOT NULL,
-                evaluated BOOLEAN DEFAULT 0,
-                success BOOLEAN DEFAULT NULL,
-                evaluation_notes TEXT,
-                FOREIGN KEY (strategy_id) REFERENCES strategies(id)
-            )
-        """)
+        
+        self._exists_checked = True
+        self._existing_count = 1
         
         await log_event("conviction_arrow_strategy_generated", {
             "message": "Generated hourly conviction arrow strategy",
@@ -94,19 +241,17 @@ class ConvictionArrowStrategy:
         Expects market_data to contain:
         - conviction_arrow: { "new_arrow": bool, "direction": str, "ema_13": float, "ema_48": float, "ema_21": float }
         """
-        # Get strategy details
-        conn = await get_db()
-        cursor = await conn.execute(
-            "SELECT id, indicator_params FROM strategies WHERE id = ?",
-            (strategy_id,)
-        )
-        strategy = await cursor.fetchone()
-        
-        if not strategy:
-            return {"triggered": False, "error": "Strategy not found"}
-        
-        strategy_id, indicator_params_json = strategy
-        indicator_params = json.loads(indicator_params_json)
+        # Get strategy details (looked up once per strategy)
+        indicator_params = self._params_cache.get(strategy_id)
+        if indicator_params is None:
+            rows = await read_fetchall(_SQL_STRATEGY_PARAMS, (strategy_id,))
+            
+            if not rows:
+                return {"triggered": False, "error": "Strategy not found"}
+            
+            strategy_id, indicator_params_json = rows[0]
+            indicator_params = json.loads(indicator_params_json)
+            self._params_cache[strategy_id] = indicator_params
         
         # Check if we have a new conviction arrow from the market data
         arrow_data = market_data.get("conviction_arrow", {})
@@ -122,43 +267,29 @@ class ConvictionArrowStrategy:
         ema_48 = arrow_data.get("ema_48")
         ema_21 = arrow_data.get("ema_21")
         
-        # Calculate evaluation due date (2-3 trading days)
-        # Note: This is simplified, in reality you'd want to count actual trading days
-        evaluation_due = datetime.now() + timedelta(days=3)
-        
-        # Log the new arrow and schedule follow-up
-        await conn.execute(
-            """
-            INSERT INTO conviction_arrow_outcomes
-            (strategy_id, arrow_time, direction, evaluation_due)
-            VALUES (?, datetime('now'), ?, ?)
-            """,
-            (strategy_id, direction, evaluation_due.isoformat())
-        )
-        
         # Auto-fail any previous unevaluated opposite arrows
         if direction == "bullish":
             opposite = "bearish"
         else:
             opposite = "bullish"
-            
-        await conn.execute(
-            """
-            UPDATE conviction_arrow_outcomes
-            SET evaluated = 1, success = 0, evaluation_notes = 'Auto-failed due to opposite arrow'
-            WHERE strategy_id = ? AND direction = ? AND evaluated = 0
-            """,
-            (strategy_id, opposite)
-        )
+        
+        # Log the new arrow and schedule follow-up in one transaction
+        await _ensure_schema()
+        async with transaction("IMMEDIATE") as conn:
+            ((outcome_id, evaluation_due),) = await conn.execute_fetchall(_SQL_INSERT_OUTCOME, (strategy_id, direction))
+            await conn.execute(_SQL_AUTO_FAIL, (strategy_id, opposite))
+        if self._next_due is None or evaluation_due < self._next_due:
+            self._due_changed.set()
         
         # Generate entry suggestion based on 21 EMA
         entry_suggestion = self._get_entry_suggestion(ema_21, direction, ema_13, ema_48)
         
         # Log the event
-        await log_event("conviction_arrow_detected", {
+        log_event_nowait("conviction_arrow_detected", {
             "strategy_id": strategy_id,
+            "outcome_id": outcome_id,
             "direction": direction,
-            "evaluation_due": evaluation_due.isoformat(),
+            "evaluation_due": evaluation_due,
             "ema_13": ema_13,
             "ema_48": ema_48,
             "ema_21": ema_21,
@@ -168,117 +299,145 @@ class ConvictionArrowStrategy:
         
         return {
             "triggered": True,
+            "outcome_id": outcome_id,
             "direction": direction,
-            "evaluation_due": evaluation_due.isoformat(),
+            "evaluation_due": evaluation_due,
             "ema_13": ema_13,
             "ema_48": ema_48,
             "ema_21": ema_21,
             "entry_suggestion": entry_suggestion,
-            "message": f"New {direction} conviction arrow detected. Will evaluate outcome by {evaluation_due.strftime('%Y-%m-%d %H:%M')}"
+            "message": f"New {direction} conviction arrow detected. Will evaluate outcome by {evaluation_due[:16]}"
         }
     
+    # Entry suggestion per (direction, sign of cross value - 21 EMA)
+    _BULL_BELOW = "Bullish conviction arrow below 21 EMA ({:.2f}). Watch for pullback to EMA for potential entry."
+    _BULL_ABOVE = "Bullish conviction arrow above 21 EMA ({:.2f}). Monitor for continuation."
+    _BEAR_ABOVE = "Bearish conviction arrow above 21 EMA ({:.2f}). Watch for bounce to EMA for potential entry."
+    _BEAR_BELOW = "Bearish conviction arrow below 21 EMA ({:.2f}). Monitor for continuation."
+    _TEMPLATES = {
+        ("bullish", -1): _BULL_BELOW, ("bullish", 0): _BULL_ABOVE, ("bullish", 1): _BULL_ABOVE,
+        ("bearish", 1): _BEAR_ABOVE, ("bearish", 0): _BEAR_BELOW, ("bearish", -1): _BEAR_BELOW,
+    }
+    
     def _get_entry_suggestion(self, ema_21: float, direction: str, ema_13: float, ema_48: float) -> str:
         """Generate entry suggestion based on 21 EMA and arrow direction (from original ThinkScript logic)."""
         cross_value = (ema_13 + ema_48) / 2
+        side = (cross_value > ema_21) - (cross_value < ema_21)
         
-        if direction == "bullish":
-            if cross_value < ema_21:
-                return f"Bullish conviction arrow below 21 EMA ({ema_21:.2f}). Watch for pullback to EMA for potential entry."
-            else:
-                return f"Bullish conviction arrow above 21 EMA ({ema_21:.2f}). Monitor for continuation."
-        elif direction == "bearish":
-            if cross_value > ema_21:
-                return f"Bearish conviction arrow above 21 EMA ({ema_21:.2f}). Watch for bounce to EMA for potential entry."
-            else:
-                return f"Bearish conviction arrow below 21 EMA ({ema_21:.2f}). Monitor for continuation."
-        return "No conviction arrow detected."
+        template = self._TEMPLATES.get((direction, side))
+        if template is None:
+            return "No conviction arrow detected."
+        return template.format(ema_21)
     
     async def check_pending_evaluations(self) -> list:
-        """Check for conviction arrows that need evaluation."""
-        conn = await get_db()
-        cursor = await conn.execute(
-            """
-            SELECT id, strategy_id, arrow_time, direction, evaluation_due
-            FROM conviction_arrow_outcomes
-            WHERE evaluated = 0 AND evaluation_due <= datetime('now')
-            """
-        )
-        pending = await cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "strategy_id": row[1],
-                "arrow_time": row[2],
-                "direction": row[3],
-                "evaluation_due": row[4]
-            }
-            for row in pending
-        ]
+        """Check for conviction arrows that need evaluation.
+        
+        Rows are returned as-is and support both row[0] and row["direction"] access.
+        """
+        await _ensure_schema()
+        return await read_fetchall(_SQL_PENDING)
+    
+    async def iter_pending_evaluations(self):
+        """Stream conviction arrows that need evaluation without loading them all."""
+        await _ensure_schema()
+        async for row in read_iter(_SQL_PENDING):
+            yield row
+    
+    async def watch_pending_evaluations(self, handler: Callable[[list], Awaitable[None]]):
+        """
+        Call handler with the due arrows whenever an evaluation deadline passes.
+        Sleeps until the earliest future evaluation_due instead of polling; a new
+        arrow with an earlier deadline wakes it. Runs until cancelled.
+        """
+        await _ensure_schema()
+        while True:
+            self._due_changed.clear()
+            # Outcomes recorded since the last pass must be applied before the
+            # pool reads them, or they would be handed to the handler again
+            await flush_writes()
+            pending = await self.check_pending_evaluations()
+            if pending:
+                await handler(pending)
+            
+            ((self._next_due, delay),) = await read_fetchall(_SQL_NEXT_DUE)
+            try:
+                await asyncio.wait_for(self._due_changed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
     
     async def record_arrow_outcome(self, outcome_id: int, success: bool, notes: str = None):
-        """Record the outcome of a conviction arrow signal."""
-        conn = await get_db()
-        await conn.execute(
-            """
-            UPDATE conviction_arrow_outcomes
-            SET evaluated = 1, success = ?, evaluation_notes = ?, 
-                evaluation_time = datetime('now')
-            WHERE id = ?
-            """,
-            (1 if success else 0, notes, outcome_id)
-        )
+        """Record the outcome of a conviction arrow signal.
+        
+        The UPDATE is queued and applied by the background writer together with
+        any other outcomes recorded meanwhile; await database.flush_writes() to
+        wait for it.
+        """
+        await _ensure_schema()
+        execute_nowait(_SQL_RECORD_OUTCOME, (1 if success else 0, notes, outcome_id))
         
         # Log the outcome
-        await log_event("conviction_arrow_evaluated", {
+        log_event_nowait("conviction_arrow_evaluated", {
             "outcome_id": outcome_id,
             "success": success,
             "notes": notes
         })
     
-    async def get_arrow_statistics(self) -> Dict[str, Any]:
-        """Get statistics about conviction arrow performance."""
-        conn = await get_db()
-        
-        # Get overall stats
-        cursor = await conn.execute(
-            """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN evaluated = 1 AND success = 1 THEN 1 ELSE 0 END) as successes,
-                SUM(CASE WHEN evaluated = 1 AND success = 0 THEN 1 ELSE 0 END) as failures,
-                SUM(CASE WHEN evaluated = 0 THEN 1 ELSE 0 END) as pending
-            FROM conviction_arrow_outcomes
-            """
-        )
-        stats = await cursor.fetchone()
+    async def get_arrow_statistics_rows(self) -> Tuple[Tuple[int, int, int, int], List[tuple]]:
+        """
+        Get (total, successes, failures, pending) and the recent arrows as
+        plain tuples ordered like RECENT_SIGNAL_FIELDS.
+        """
+        await _ensure_schema()
         
-        # Get recent arrows
-        cursor = await conn.execute(
-            """
-            SELECT direction, arrow_time, evaluated, success, evaluation_notes
-            FROM conviction_arrow_outcomes
-            ORDER BY arrow_time DESC LIMIT 5
-            """
+        # Overall stats and recent arrows are independent - run them on two
+        # pooled read connections at once
+        (stats,), recent = await asyncio.gather(
+            read_fetchall(_SQL_STATS), read_fetchall(_SQL_RECENT)
         )
-        recent = await cursor.fetchall()
+        return tuple(stats), [tuple(row) for row in recent]
+    
+    async def get_arrow_statistics(self) -> Dict[str, Any]:
+        """Get statistics about conviction arrow performance."""
+        (total, successes, failures, pending), recent = await self.get_arrow_statistics_rows()
         
         return {
-            "total_signals": stats[0],
-            "successful": stats[1],
-            "failed": stats[2],
-            "pending_evaluation": stats[3],
-            "success_rate": (stats[1] / (stats[1] + stats[2])) if (stats[1] + stats[2]) > 0 else 0,
+            "total_signals": total,
+            "successful": successes,
+            "failed": failures,
+            "pending_evaluation": pending,
+            "success_rate": _success_rate(successes, failures),
             "recent_signals": [
                 {
-                    "direction": row[0],
-                    "time": row[1],
-                    "evaluated": bool(row[2]),
-                    "success": bool(row[3]) if row[2] else None,
-                    "notes": row[4]
+                    "direction": direction,
+                    "time": time,
+                    "evaluated": bool(evaluated),
+                    "success": None if success is None else bool(success),
+                    "notes": notes
                 }
-                for row in recent
+                for direction, time, evaluated, success, notes in recent
             ]
         }
+    
+    async def get_arrow_statistics_json(self) -> bytes:
+        """
+        Get the statistics serialized for the API. recent_signals are row
+        lists (fields in recent_signal_fields) rather than one object each.
+        """
+        (total, successes, failures, pending), recent = await self.get_arrow_statistics_rows()
+        
+        return _dumps({
+            "total_signals": total,
+            "successful": successes,
+            "failed": failures,
+            "pending_evaluation": pending,
+            "success_rate": _success_rate(successes, failures),
+            "recent_signal_fields": RECENT_SIGNAL_FIELDS,
+            "recent_signals": recent
+        })
+
+def _success_rate(successes: int, failures: int) -> float:
+    evaluated = successes + failures
+    return successes / evaluated if evaluated > 0 else 0
 
 # Global instance
 conviction_arrow_strategy = ConvictionArrowStrategy() 
\ No newline at end of file
@@ -1,175 +1,137 @@
 #!/usr/bin/env python3
 """
 Correct Bootstrap Strategy - Feed data directly to appropriate timeframes
+
+Importing this module installs the direct-to-cache bootstrap on SPXATRSystem.
+The class is patched in memory (atr_system.py is never rewritten), so the
+import is idempotent and costs no disk I/O beyond loading the modules.
 """
 
-# Read the current file
-with open('atr_system.py', 'r') as f:
-    content = f.read()
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional
 
-# Replace the entire bootstrap method with the correct approach
-old_bootstrap = '''    async def _bootstrap_historical_data(self, timeframe: str) -> bool:
-        """Bootstrap historical data from database instead of API"""
-        try:
-            logger.info(f"📊 Loading historical data from database for {timeframe} timeframe...")
-            
-            # Map timeframes to database timeframes
-            timeframe_mapping = {
-                "scalp": "1min_10d",      # Use 1-min for 4h aggregation
-                "day": "daily_20y",       # Use daily data
-                "multiday": "weekly_20y", # Use weekly data  
-                "swing": "monthly_20y",   # Use monthly data
-                "position": "monthly_20y", # Aggregate monthly to quarterly
-                "long_term": "monthly_20y" # Aggregate monthly to yearly
-            }
-            
-            db_timeframe = timeframe_mapping.get(timeframe, "daily_20y")
-            
-            # Determine how much data we need
-            timeframe_limits = {
-                "scalp": 500,     # 500 1-min bars for 4h aggregation
-                "day": 100,       # 100 daily bars
-                "multiday": 100,  # 100 weekly bars
-                "swing": 100,     # 100 monthly bars
-                "position": 100,  # 100 monthly bars (will aggregate)
-                "long_term": 100  # 100 monthly bars (will aggregate)
-            }
-            
-            limit = timeframe_limits.get(timeframe, 100)
-            
-            # Connect to database
-            import sqlite3
-            conn = sqlite3.connect("/opt/spx-atr/data/spx_tracking.db")
-            cursor = conn.cursor()
-            
-            # Get historical data
-            cursor.execute("""
-                SELECT timestamp, open_price, high_price, low_price, close_price, volume
-                FROM historical_candles 
-                WHERE timeframe = ?
-                ORDER BY timestamp ASC
-                LIMIT ?
-            """, (db_timeframe, limit))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            if not results:
-                logger.warning(f"⚠️  No historical data found for {timeframe} ({db_timeframe})")
-                return False
-            
-            logger.info(f"✅ Retrieved {len(results)} historical candles for {timeframe}")
-            
-            # Process data based on timeframe
-            if timeframe == "scalp":
-                # For scalp (4h), aggregate 1-min data into 4h bars
-                await self._process_minute_data_for_4h(results)
-            else:
-                # For other timeframes, use data directly
-                await self._process_historical_bars(results, timeframe)
-                
-            # Verify we now have enough data
-            historical_candles = self.timeframe_aggregator.get_timeframe_history(timeframe, periods=30)
-            logger.info(f"📈 After bootstrap: {len(historical_candles)} {timeframe} bars available")
-            
-            return len(historical_candles) >= 14
-            
-        except Exception as e:
-            logger.error(f"❌ Database bootstrap failed for {timeframe}: {e}")
-            return False'''
+import numpy as np
+
+from atr_system import SPXATRSystem
+from database import ReadPool
+from timeframe_aggregator import CANDLE_EPOCH_ROW_DTYPE
+
+logger = logging.getLogger(__name__)
+
+HISTORICAL_DB_PATH = "/opt/spx-atr/data/spx_tracking.db"
+
+# Map timeframes to database timeframes
+TIMEFRAME_MAPPING = {
+    "scalp": "1min_10d",      # Use 1-min for 4h aggregation (only this needs aggregation)
+    "day": "daily_20y",       # Direct: daily data → daily timeframe
+    "multiday": "weekly_20y", # Direct: weekly data → multiday timeframe
+    "swing": "monthly_20y",   # Direct: monthly data → swing timeframe
+    "position": "monthly_20y", # Will aggregate monthly → quarterly
+    "long_term": "monthly_20y" # Will aggregate monthly → yearly
+}
+BOOTSTRAP_LIMIT = 100  # Get 100 bars for all timeframes
+
+HISTORICAL_CANDLES_SQL = """
+    SELECT CAST(strftime('%s', timestamp) AS INTEGER), open_price, high_price, low_price, close_price, volume
+    FROM historical_candles
+    WHERE timeframe = ?
+    ORDER BY timestamp ASC
+    LIMIT ?
+"""
+
+# Persistent read-only connections to the historical database: each keeps the
+# candles statement prepared across bootstraps until the system shuts down
+HISTORICAL_PRAGMAS = """
+PRAGMA cache_size=-64000;
+PRAGMA temp_store=MEMORY;
+PRAGMA query_only=ON;
+"""
+_historical_pool: Optional[ReadPool] = None
+
+
+def _get_historical_pool() -> ReadPool:
+    global _historical_pool
+    if _historical_pool is None:
+        _historical_pool = ReadPool(path=HISTORICAL_DB_PATH, pragmas=HISTORICAL_PRAGMAS, row_factory=None)
+    return _historical_pool
+
+
+async def close_historical_pool():
+    global _historical_pool
+    # Detach first so a bootstrap starting mid-close opens a fresh pool
+    pool, _historical_pool = _historical_pool, None
+    if pool is not None:
+        await pool.close()
 
-new_bootstrap = '''    async def _bootstrap_historical_data(self, timeframe: str) -> bool:
-        """Bootstrap historical data from database - feed directly to aggregator cache"""
+
+async def _fetch_candles(db_timeframe: str) -> list:
+    """Fetch one database timeframe's candles on a pooled connection"""
+    async with _get_historical_pool().acquire() as conn:
+        return await conn.execute_fetchall(HISTORICAL_CANDLES_SQL, (db_timeframe, BOOTSTRAP_LIMIT))
+
+
+def _load_candles(self, timeframe: str, results: list) -> bool:
+    """Feed fetched candle rows to the aggregator"""
+    if not results:
+        logger.warning(f"⚠️  No historical data found for {timeframe} ({TIMEFRAME_MAPPING.get(timeframe, 'daily_20y')})")
+        return False
+
+    logger.info(f"✅ Retrieved {len(results)} historical candles for {timeframe}")
+
+    # Load the rows as NumPy columns; SQLite already parsed timestamps to epoch seconds
+    bars = np.fromiter(results, dtype=CANDLE_EPOCH_ROW_DTYPE, count=len(results))
+    timestamps = bars['ts'].astype('datetime64[s]')
+
+    # Special handling for scalp (needs aggregation from 1-min): feed the
+    # minute buffer; other timeframes go directly to their aggregator cache
+    self.timeframe_aggregator.add_bars_bulk(
+        timestamps, bars['o'], bars['h'], bars['l'], bars['c'], bars['v'],
+        timeframe="1m" if timeframe == "scalp" else timeframe
+    )
+
+    logger.info(f"📈 Bootstrap complete: {len(bars)} {timeframe} bars loaded")
+    return len(bars) >= 14
+
+
+async def bootstrap_timeframes(self, timeframes: Iterable[str] = TIMEFRAME_MAPPING) -> Dict[str, bool]:
+    """
+    Bootstrap several timeframes from the database at once.
+    Each distinct database timeframe is queried once, all queries concurrently.
+    """
+    timeframes = list(timeframes)
+    for timeframe in timeframes:
+        logger.info(f"📊 Loading historical data from database for {timeframe} timeframe...")
+
+    db_timeframes = list(dict.fromkeys(TIMEFRAME_MAPPING.get(tf, "daily_20y") for tf in timeframes))
+    fetched = dict(zip(db_timeframes, await asyncio.gather(
+        *(_fetch_candles(db_timeframe) for db_timeframe in db_timeframes), return_exceptions=True
+    )))
+
+    loaded = {}
+    for timeframe in timeframes:
         try:
-            logger.info(f"📊 Loading historical data from database for {timeframe} timeframe...")
-            
-            # Map timeframes to database timeframes
-            timeframe_mapping = {
-                "scalp": "1min_10d",      # Use 1-min for 4h aggregation (only this needs aggregation)
-                "day": "daily_20y",       # Direct: daily data → daily timeframe
-                "multiday": "weekly_20y", # Direct: weekly data → multiday timeframe  
-                "swing": "monthly_20y",   # Direct: monthly data → swing timeframe
-                "position": "monthly_20y", # Will aggregate monthly → quarterly
-                "long_term": "monthly_20y" # Will aggregate monthly → yearly
-            }
-            
-            db_timeframe = timeframe_mapping.get(timeframe, "daily_20y")
-            limit = 100  # Get 100 bars for all timeframes
-            
-            # Connect to database
-            import sqlite3
-            conn = sqlite3.connect("/opt/spx-atr/data/spx_tracking.db")
-            cursor = conn.cursor()
-            
-            # Get historical data
-            cursor.execute("""
-                SELECT timestamp, open_price, high_price, low_price, close_price, volume
-                FROM historical_candles 
-                WHERE timeframe = ?
-                ORDER BY timestamp ASC
-                LIMIT ?
-            """, (db_timeframe, limit))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            if not results:
-                logger.warning(f"⚠️  No historical data found for {timeframe} ({db_timeframe})")
-                return False
-            
-            logger.info(f"✅ Retrieved {len(results)} historical candles for {timeframe}")
-            
-            # Convert to OHLCBar objects and feed directly to the aggregator cache
-            from dataclasses import dataclass
-            from datetime import datetime
-            from typing import List
-            
-            bars = []
-            for row in results:
-                timestamp_str, open_price, high_price, low_price, close_price, volume = row
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                
-                # Create OHLCBar object
-                bar = OHLCBar(
-                    timestamp=timestamp,
-                    open=open_price,
-                    high=high_price,
-                    low=low_price,
-                    close=close_price,
-                    volume=volume,
-                    timeframe=timeframe
-                )
-                bars.append(bar)
-            
-            # Special handling for scalp (needs aggregation from 1-min)
-            if timeframe == "scalp":
-                # Feed 1-min data for aggregation to 4h
-                for bar in bars:
-                    self.timeframe_aggregator.add_minute_bar(
-                        bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume
-                    )
-            else:
-                # Feed directly to the aggregator cache for this timeframe
-                self.timeframe_aggregator.aggregated_cache[timeframe] = bars
-            
-            logger.info(f"📈 Bootstrap complete: {len(bars)} {timeframe} bars loaded")
-            return len(bars) >= 14
-            
+            results = fetched[TIMEFRAME_MAPPING.get(timeframe, "daily_20y")]
+            if isinstance(results, BaseException):
+                raise results
+            loaded[timeframe] = _load_candles(self, timeframe, results)
         except Exception as e:
             logger.error(f"❌ Database bootstrap failed for {timeframe}: {e}")
-            return False'''
-
-# Replace the method
-if old_bootstrap in content:
-    new_content = content.replace(old_bootstrap, new_bootstrap)
-    
-    # Write the updated content
-    with open('atr_system.py', 'w') as f:
-        f.write(new_content)
-    
-    print("✅ Implemented CORRECT bootstrap strategy!")
-    print("🎯 Now feeds data directly to appropriate timeframe caches")
-    print("📊 Only scalp (1min→4h) uses aggregation, others are direct")
-else:
-    print("❌ Could not find the bootstrap method to replace")
+            loaded[timeframe] = False
+    return loaded
+
+
+async def _bootstrap_historical_data(self, timeframe: str) -> bool:
+    """Bootstrap historical data from database - feed directly to aggregator cache"""
+    return (await bootstrap_timeframes(self, [timeframe]))[timeframe]
+
+
+async def _release_bootstrap(self):
+    """Close the historical pool when the system stops processing"""
+    await close_historical_pool()
+
 
+# Install the methods; re-importing (or reloading) just assigns them again
+SPXATRSystem._bootstrap_historical_data = _bootstrap_historical_data
+SPXATRSystem.bootstrap_timeframes = bootstrap_timeframes
+SPXATRSystem._release_bootstrap = _release_bootstrap
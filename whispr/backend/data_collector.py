@@ -7,20 +7,61 @@ Consolidates all duplicate data feed files into one modular component.
 
 import asyncio
 import json
+import ssl
+import time
 import aiohttp
+from contextlib import asynccontextmanager
+from yarl import URL
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator, Tuple, Union
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote as url_quote, urlencode
 import logging
 
-from database import log_event
+import numpy as np
+
+from database import log_event, log_event_nowait
 from schwab_config import SchwabOAuthManager
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib decoder
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional - fall back to decoding whole responses
+    ijson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to the pure-Python kernel
+    njit = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Client-side pacing for the Schwab API (120 requests/minute): at most this
+# many requests in flight, drawn from a token bucket refilled at 2/second
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_SECOND = 2.0
+REQUEST_BURST = 10
+# Initial capacity of the array price history is streamed into (doubles as needed)
+CANDLE_BUFFER_SIZE = 1024
+# Ticks stream_real_time buffers between its polling task and the consumer
+STREAM_QUEUE_SIZE = 64
+# Pause applied on a 429 whose Retry-After header is missing or unparseable
+DEFAULT_RETRY_AFTER = 1.0
+# Refresh the cached bearer this long before the token expires (matches the
+# OAuth manager's own refresh window), or after this long if expiry is unknown
+TOKEN_REFRESH_MARGIN = 300.0
+TOKEN_CACHE_SECONDS = 60.0
+
+@dataclass(slots=True)
 class MarketTick:
     """Standardized market tick data structure"""
     symbol: str
@@ -32,7 +73,7 @@ class MarketTick:
     bid: Optional[float] = None
     ask: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class OHLCCandle:
     """OHLC candle data structure for timeframe aggregation"""
     symbol: str
@@ -44,6 +85,109 @@ class OHLCCandle:
     volume: int
     timeframe: str
 
+# Schwab pricehistory candle as one structured row; ts is epoch milliseconds
+CANDLE_DTYPE = np.dtype([
+    ('ts', 'i8'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('v', 'i8')
+])
+
+def candles_to_array(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """Pack a pricehistory ``candles`` list into a CANDLE_DTYPE array"""
+    return np.fromiter(
+        ((c["datetime"], c["open"], c["high"], c["low"], c["close"], c["volume"]) for c in candles),
+        dtype=CANDLE_DTYPE, count=len(candles)
+    )
+
+def candles_from_array(symbol: str, bars: np.ndarray, timeframe: str) -> List[OHLCCandle]:
+    """Materialize OHLCCandle objects from a CANDLE_DTYPE array"""
+    # One vectorized ms -> datetime conversion; tolist() yields naive UTC datetimes
+    timestamps = bars['ts'].astype('datetime64[ms]').tolist()
+    return [
+        OHLCCandle(symbol, ts.replace(tzinfo=timezone.utc), o, h, l, c, v, timeframe)
+        for ts, o, h, l, c, v in zip(
+            timestamps, bars['o'].tolist(), bars['h'].tolist(), bars['l'].tolist(),
+            bars['c'].tolist(), bars['v'].tolist()
+        )
+    ]
+
+def _aggregate_ohlc(ts, o, h, l, c, v, window, out_ts, out_o, out_h, out_l, out_c, out_v):
+    """
+    Roll time-ordered bars up into buckets of ``window`` (same unit as ts),
+    writing one bar per bucket into the out_ arrays; returns the bucket count.
+    Each bucket is stamped with its start: open first, high max, low min,
+    close last, volume summed.
+    """
+    n = -1
+    bucket = 0
+    for i in range(len(ts)):
+        current = ts[i] // window
+        if n < 0 or current != bucket:
+            n += 1
+            bucket = current
+            out_ts[n] = current * window
+            out_o[n] = o[i]
+            out_h[n] = h[i]
+            out_l[n] = l[i]
+            out_v[n] = 0
+        elif h[i] > out_h[n]:
+            out_h[n] = h[i]
+        if l[i] < out_l[n]:
+            out_l[n] = l[i]
+        out_c[n] = c[i]
+        out_v[n] += v[i]
+    return n + 1
+
+
+def _candle_atr(h, l, c, length):
+    """
+    Wilder ATR straight from candle columns, PREVIOUS period like ThinkScript [1]:
+    true ranges max(H, PC) - min(L, PC) of bars 1..n-2 (the latest bar is excluded),
+    first ATR their simple average, then ATR = ((previous_ATR * (n-1)) + TR) / n
+    """
+    total = 0.0
+    for i in range(1, length + 1):
+        total += max(h[i], c[i - 1]) - min(l[i], c[i - 1])
+    atr = total / length
+    
+    for i in range(length + 1, len(c) - 1):
+        atr = ((atr * (length - 1)) + (max(h[i], c[i - 1]) - min(l[i], c[i - 1]))) / length
+    return atr
+
+
+if njit is not None:
+    # Eager signatures compile at import, not on the first ATR request, and
+    # cache=True keeps the machine code in __pycache__ across restarts
+    _aggregate_ohlc = njit(
+        "int64(int64[::1], float64[::1], float64[::1], float64[::1], float64[::1], int64[::1], int64,"
+        " int64[::1], float64[::1], float64[::1], float64[::1], float64[::1], int64[::1])",
+        cache=True
+    )(_aggregate_ohlc)
+    _candle_atr = njit("float64(float64[::1], float64[::1], float64[::1], int64)", cache=True)(_candle_atr)
+
+def candles_atr(bars: np.ndarray, length: int = 14) -> Optional[float]:
+    """
+    ATR of CANDLE_DTYPE bars with the same rules as ATRCalculator.calculate_atr
+    (None until there are length + 2 bars)
+    """
+    if len(bars) < length + 2:
+        return None
+    return float(_candle_atr(
+        np.ascontiguousarray(bars['h']), np.ascontiguousarray(bars['l']), np.ascontiguousarray(bars['c']), length
+    ))
+
+def aggregate_ohlc(bars: np.ndarray, window_minutes: int) -> np.ndarray:
+    """
+    Aggregate time-ordered CANDLE_DTYPE bars (e.g. from get_minute_data with
+    materialize=False) into window_minutes bars, returned as CANDLE_DTYPE.
+    """
+    columns = [np.ascontiguousarray(bars[name]) for name in CANDLE_DTYPE.names]
+    out = [np.empty(len(bars), dtype=column.dtype) for column in columns]
+    count = _aggregate_ohlc(*columns, window_minutes * 60_000, *out)
+    
+    result = np.empty(count, dtype=CANDLE_DTYPE)
+    for name, column in zip(CANDLE_DTYPE.names, out):
+        result[name] = column[:count]
+    return result
+
 class SchwabDataCollector:
     """
     Pure Schwab API data collector - Single source of truth for market data.
@@ -60,15 +204,40 @@ class SchwabDataCollector:
             "SPX": "$SPX",      # S&P 500 Index - direct access!
         }
         
+        # Create SSL context that ignores certificate verification (for macOS);
+        # built once and reused by every session this collector opens
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.check_hostname = False
+        self._ssl_context.verify_mode = ssl.CERT_NONE
+        
+        # One HTTP session (and its connection pool) shared by every request;
+        # created on first use so it binds to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Authorization header, reused until the access token nears expiry
+        self._auth_headers: Optional[Dict[str, str]] = None
+        self._auth_expiry = 0.0  # time.monotonic() deadline
+        
+        # Serializes lazy connects from concurrent requests
+        self._connect_lock = asyncio.Lock()
+        
+        # Rate limiting shared by every request from this collector
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._bucket_lock = asyncio.Lock()
+        self._bucket_tokens = float(REQUEST_BURST)
+        self._bucket_last = time.monotonic()
+        self._paused_until = 0.0  # Set from Retry-After on a 429
+        
         # Track active symbols and performance
         self.active_symbols = set()
         self.stats = {
             "api_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
-            "last_request_time": None,
             "connection_status": "disconnected"
         }
+        # Wall-clock ns of the latest request, formatted only by get_stats
+        self._last_request_ns: Optional[int] = None
         
         logger.info("🎯 Schwab Data Collector initialized")
     
@@ -76,57 +245,175 @@ class SchwabDataCollector:
         """Map internal symbol to Schwab API format"""
         return self.symbol_map.get(symbol, symbol)
     
-    async def _make_api_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make authenticated API request to Schwab with error handling"""
-        self.stats["api_requests"] += 1
-        self.stats["last_request_time"] = datetime.now().isoformat()
+    def _parse_quote(self, symbol: str, data: Dict[str, Any],
+                     timestamp: Optional[datetime] = None) -> Optional[MarketTick]:
+        """Build a MarketTick from one symbol's quote payload (None without a price)"""
+        # Indices carry prices in a quote section; fall back to the top level
+        quote = data.get("quote", data)
+        last_price = quote.get("lastPrice", 0.0)
+        if not last_price > 0:
+            return None
+        
+        if quote is not data:
+            high_price = quote.get("highPrice", last_price) or quote.get("52WeekHigh", last_price)
+            low_price = quote.get("lowPrice", last_price) or quote.get("52WeekLow", last_price)
+        else:
+            high_price = quote.get("highPrice", last_price)
+            low_price = quote.get("lowPrice", last_price)
         
+        return MarketTick(
+            symbol=symbol,
+            price=last_price,
+            high=high_price,
+            low=low_price,
+            volume=quote.get("totalVolume", 0),
+            timestamp=timestamp or datetime.now(timezone.utc),
+            bid=quote.get("bidPrice"),
+            ask=quote.get("askPrice")
+        )
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, opening it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(ssl=self._ssl_context)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def _acquire_token(self):
+        """Wait for a request token from the bucket (and out any 429 pause)"""
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                
+                self._bucket_tokens = min(
+                    REQUEST_BURST, self._bucket_tokens + (now - self._bucket_last) * REQUESTS_PER_SECOND
+                )
+                self._bucket_last = now
+                if self._bucket_tokens >= 1:
+                    self._bucket_tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._bucket_tokens) / REQUESTS_PER_SECOND)
+    
+    def _pause_for_retry_after(self, retry_after: Optional[str]):
+        """Hold back every request until the server's Retry-After has passed"""
         try:
-            # Load tokens if not already loaded
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = DEFAULT_RETRY_AFTER
+        self._paused_until = max(self._paused_until, time.monotonic() + max(delay, 0.0))
+    
+    async def _get_auth_headers(self) -> Dict[str, str]:
+        """Return the cached Authorization header, reloading tokens when due"""
+        if self._auth_headers is None or time.monotonic() >= self._auth_expiry:
+            # Reload in case another process refreshed the token file
             await self.oauth_manager.load_tokens()
             access_token = await self.oauth_manager.get_valid_access_token()
             
-            headers = {
+            tokens = getattr(self.oauth_manager, "tokens", None)
+            expires_at = getattr(tokens, "expires_at", None)
+            if expires_at is not None:
+                ttl = (expires_at - datetime.now()).total_seconds() - TOKEN_REFRESH_MARGIN
+            else:
+                ttl = TOKEN_CACHE_SECONDS
+            
+            self._auth_headers = {
                 "Authorization": f"Bearer {access_token}",
                 # Don't send Content-Type for GET requests
             }
-            
-            # Manually construct URL to avoid aiohttp encoding issues with $SPX
-            if params and 'symbols' in params and '$SPX' in params['symbols']:
-                # Special handling for $SPX - construct URL manually
-                url = f"{self.base_url}{endpoint}?symbols=%24SPX"
-                params = None
-            else:
-                url = f"{self.base_url}{endpoint}"
-            
-            logger.info(f"🔗 Final URL: {url}")
-            
-            # Create SSL context that ignores certificate verification (for macOS)
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        self.stats["successful_requests"] += 1
-                        return await response.json()
-                    else:
-                        self.stats["failed_requests"] += 1
-                        error_text = await response.text()
-                        logger.error(f"Schwab API request failed: {response.status}")
-                        logger.error(f"URL: {url}")
-                        logger.error(f"Params: {params}")
-                        logger.error(f"Response: {error_text}")
-                        raise Exception(f"Schwab API error: {response.status} - {error_text}")
-                        
+            self._auth_expiry = time.monotonic() + ttl
+        return self._auth_headers
+    
+    def _build_url(self, endpoint: str, params: Optional[Dict[str, Any]]) -> URL:
+        """
+        Build the request URL with its query already percent-encoded ($SPX ->
+        %24SPX, commas kept between batched symbols); encoded=True stops
+        yarl and aiohttp from re-quoting it
+        """
+        query = urlencode(params, quote_via=url_quote, safe=",") if params else ""
+        return URL(f"{self.base_url}{endpoint}?{query}" if query else f"{self.base_url}{endpoint}", encoded=True)
+    
+    async def _send_request(self, endpoint: str, params: Dict[str, Any] = None) -> aiohttp.ClientResponse:
+        """
+        Send an authenticated GET to Schwab, returning the 200 response with a
+        request slot still held for the caller to release
+        """
+        try:
+            url = self._build_url(endpoint, params)
+            
+            logger.debug("🔗 Final URL: %s", url)
+            
+            # A 401 means the cached token went stale early - reload it and
+            # retry once
+            for attempt in range(2):
+                headers = await self._get_auth_headers()
+                await self._request_slots.acquire()
+                try:
+                    await self._acquire_token()
+                    response = await self._get_session().get(url, headers=headers)
+                except BaseException:
+                    self._request_slots.release()
+                    raise
+                if response.status == 200:
+                    return response
+                try:
+                    async with response:
+                        if response.status == 401 and attempt == 0:
+                            self._auth_headers = None
+                            continue
+                        if response.status == 429:
+                            self._pause_for_retry_after(response.headers.get("Retry-After"))
+                        error_text = (await response.read()).decode(errors="replace")
+                finally:
+                    self._request_slots.release()
+                logger.error(f"Schwab API request failed: {response.status}")
+                logger.error(f"URL: {url}")
+                logger.error(f"Params: {params}")
+                logger.error(f"Response: {error_text}")
+                raise Exception(f"Schwab API error: {response.status} - {error_text}")
+                
         except Exception as e:
             self.stats["failed_requests"] += 1
             logger.error(f"Schwab API request error: {e}")
             raise
     
+    @asynccontextmanager
+    async def _open_api_request(self, endpoint: str, params: Dict[str, Any] = None) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Make authenticated API request to Schwab with error handling, yielding
+        the successful response with its body still unread
+        """
+        self.stats["api_requests"] += 1
+        self._last_request_ns = time.time_ns()
+        
+        # Errors raised while the caller reads the body are the caller's own -
+        # only the request itself is counted and logged as failed
+        response = await self._send_request(endpoint, params)
+        self.stats["successful_requests"] += 1
+        try:
+            async with response:
+                yield response
+        finally:
+            self._request_slots.release()
+    
+    async def _make_api_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Make authenticated API request to Schwab and decode the JSON body"""
+        async with self._open_api_request(endpoint, params) as response:
+            return await response.json(loads=_loads)
+    
+    async def _ensure_connected(self) -> bool:
+        """Connect on first use; concurrent callers share a single connect()"""
+        if not self.connected:
+            async with self._connect_lock:
+                if not self.connected:
+                    return await self.connect()
+        return True
+    
     async def connect(self) -> bool:
         """Connect to Schwab API and validate authentication"""
         try:
@@ -138,12 +425,15 @@ class SchwabDataCollector:
                 {"symbols": "$SPX"}
             )
             
-            logger.info(f"🔍 Response keys: {list(test_response.keys())}")
-            logger.info(f"🔍 Full response: {test_response}")
+            # Debug-only dumps: formatting the whole response costs O(size)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 Response keys: %s", list(test_response.keys()))
+                logger.debug("🔍 Full response: %s", test_response)
             
             if "$SPX" in test_response:
                 spx_data = test_response["$SPX"]
-                logger.info(f"🔍 SPX data keys: {list(spx_data.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🔍 SPX data keys: %s", list(spx_data.keys()))
                 
                 # Check for price in quote section
                 if "quote" in spx_data and "lastPrice" in spx_data["quote"]:
@@ -176,13 +466,12 @@ class SchwabDataCollector:
     
     async def get_current_price(self, symbol: str) -> Optional[MarketTick]:
         """Get current market price for symbol"""
-        if not self.connected:
-            if not await self.connect():
-                return None
+        if not await self._ensure_connected():
+            return None
         
         try:
             schwab_symbol = self._map_symbol(symbol)
-            logger.info(f"🔍 Getting quote for {symbol} -> {schwab_symbol}")
+            logger.debug("🔍 Getting quote for %s -> %s", symbol, schwab_symbol)
             
             # Try the quote endpoint with symbol as parameter
             # Don't URL encode here - aiohttp will handle it properly
@@ -192,33 +481,9 @@ class SchwabDataCollector:
             )
             
             if schwab_symbol in response:
-                data = response[schwab_symbol]
-                
-                # Extract price data from quote section for indices
-                if "quote" in data:
-                    quote = data["quote"]
-                    last_price = quote.get("lastPrice", 0.0)
-                    high_price = quote.get("highPrice", last_price) or quote.get("52WeekHigh", last_price)
-                    low_price = quote.get("lowPrice", last_price) or quote.get("52WeekLow", last_price)
-                    volume = quote.get("totalVolume", 0)
-                else:
-                    # Fallback for other data structures
-                    last_price = data.get("lastPrice", 0.0)
-                    high_price = data.get("highPrice", last_price)
-                    low_price = data.get("lowPrice", last_price)
-                    volume = data.get("totalVolume", 0)
-                
-                if last_price > 0:
-                    return MarketTick(
-                        symbol=symbol,
-                        price=last_price,
-                        high=high_price,
-                        low=low_price,
-                        volume=volume,
-                        timestamp=datetime.now(timezone.utc),
-                        bid=quote.get("bidPrice"),
-                        ask=quote.get("askPrice")
-                    )
+                tick = self._parse_quote(symbol, response[schwab_symbol])
+                if tick:
+                    return tick
             
             logger.warning(f"No price data found for {symbol}")
             return None
@@ -227,159 +492,144 @@ class SchwabDataCollector:
             logger.error(f"Error getting current price for {symbol}: {e}")
             return None
     
-    async def get_minute_data(self, symbol: str, days: int = 1) -> List[OHLCCandle]:
+    async def _get_price_history(self, symbol: str, days: int, frequency_type: str) -> np.ndarray:
+        """Fetch one pricehistory series as a CANDLE_DTYPE array"""
+        schwab_symbol = self._map_symbol(symbol)
+        
+        params = {
+            "symbol": schwab_symbol,
+            "periodType": "day",
+            "period": days,
+            "frequencyType": frequency_type,
+            "frequency": 1,
+            "needExtendedHoursData": "false"  # Regular trading hours only
+        }
+        if ijson is None:
+            response = await self._make_api_request("/marketdata/v1/pricehistory", params)
+            return candles_to_array(response.get("candles", ()))
+        
+        # Stream-parse the body straight into the array, so the full JSON
+        # document never sits in memory next to it
+        async with self._open_api_request("/marketdata/v1/pricehistory", params) as response:
+            bars = np.empty(CANDLE_BUFFER_SIZE, dtype=CANDLE_DTYPE)
+            count = 0
+            async for candle in ijson.items_async(response.content, "candles.item", use_float=True):
+                if count == len(bars):
+                    grown = np.empty(2 * len(bars), dtype=CANDLE_DTYPE)
+                    grown[:count] = bars
+                    bars = grown
+                bars[count] = (
+                    candle["datetime"], candle["open"], candle["high"], candle["low"],
+                    candle["close"], candle["volume"]
+                )
+                count += 1
+            return bars[:count].copy()
+    
+    async def get_minute_data(self, symbol: str, days: int = 1,
+                              materialize: bool = True) -> Union[List[OHLCCandle], np.ndarray]:
         """
         Get minute-level OHLC data - Foundation for your ATR level tracking.
         This is the ONLY timeframe you need to collect - everything else is aggregation.
+        With materialize=False the candles come back as a CANDLE_DTYPE array.
         """
-        if not self.connected:
-            if not await self.connect():
-                return []
+        empty = [] if materialize else np.empty(0, dtype=CANDLE_DTYPE)
+        if not await self._ensure_connected():
+            return empty
         
         try:
-            schwab_symbol = self._map_symbol(symbol)
-            
-            # Get minute data from Schwab
-            response = await self._make_api_request(
-                "/marketdata/v1/pricehistory",
-                {
-                    "symbol": schwab_symbol,
-                    "periodType": "day",
-                    "period": days,
-                    "frequencyType": "minute",
-                    "frequency": 1,
-                    "needExtendedHoursData": False  # Regular trading hours only
-                }
-            )
+            bars = await self._get_price_history(symbol, days, "minute")
             
-            candles = []
-            if "candles" in response:
-                for candle_data in response["candles"]:
-                    # Convert timestamp from milliseconds to datetime
-                    timestamp = datetime.fromtimestamp(
-                        candle_data["datetime"] / 1000, 
-                        timezone.utc
-                    )
-                    
-                    candle = OHLCCandle(
-                        symbol=symbol,
-                        timestamp=timestamp,
-                        open=candle_data["open"],
-                        high=candle_data["high"],
-                        low=candle_data["low"],
-                        close=candle_data["close"],
-                        volume=candle_data["volume"],
-                        timeframe="1m"
-                    )
-                    candles.append(candle)
-            
-            logger.info(f"✅ Retrieved {len(candles)} minute candles for {symbol}")
+            logger.info(f"✅ Retrieved {len(bars)} minute candles for {symbol}")
             
             # Log data collection for tracking
             await log_event("minute_data_collected", {
                 "symbol": symbol,
-                "candle_count": len(candles),
+                "candle_count": len(bars),
                 "days": days,
                 "timestamp": datetime.now().isoformat()
             })
             
-            return candles
+            return candles_from_array(symbol, bars, "1m") if materialize else bars
             
         except Exception as e:
             logger.error(f"Error getting minute data for {symbol}: {e}")
-            return []
+            return empty
     
-    async def get_daily_data(self, symbol: str, days: int = 30) -> List[OHLCCandle]:
-        """Get daily OHLC data for ATR calculations"""
-        if not self.connected:
-            if not await self.connect():
-                return []
+    async def get_daily_data(self, symbol: str, days: int = 30,
+                             materialize: bool = True) -> Union[List[OHLCCandle], np.ndarray]:
+        """
+        Get daily OHLC data for ATR calculations.
+        With materialize=False the candles come back as a CANDLE_DTYPE array.
+        """
+        empty = [] if materialize else np.empty(0, dtype=CANDLE_DTYPE)
+        if not await self._ensure_connected():
+            return empty
         
         try:
-            schwab_symbol = self._map_symbol(symbol)
-            
-            response = await self._make_api_request(
-                "/marketdata/v1/pricehistory",
-                {
-                    "symbol": schwab_symbol,
-                    "periodType": "day",
-                    "period": days,
-                    "frequencyType": "daily",
-                    "frequency": 1,
-                    "needExtendedHoursData": False
-                }
-            )
+            bars = await self._get_price_history(symbol, days, "daily")
             
-            candles = []
-            if "candles" in response:
-                for candle_data in response["candles"]:
-                    timestamp = datetime.fromtimestamp(
-                        candle_data["datetime"] / 1000, 
-                        timezone.utc
-                    )
-                    
-                    candle = OHLCCandle(
-                        symbol=symbol,
-                        timestamp=timestamp,
-                        open=candle_data["open"],
-                        high=candle_data["high"],
-                        low=candle_data["low"],
-                        close=candle_data["close"],
-                        volume=candle_data["volume"],
-                        timeframe="1d"
-                    )
-                    candles.append(candle)
-            
-            logger.info(f"✅ Retrieved {len(candles)} daily candles for {symbol}")
-            return candles
+            logger.info(f"✅ Retrieved {len(bars)} daily candles for {symbol}")
+            return candles_from_array(symbol, bars, "1d") if materialize else bars
             
         except Exception as e:
             logger.error(f"Error getting daily data for {symbol}: {e}")
-            return []
+            return empty
     
     async def stream_real_time(self, symbols: List[str], interval_seconds: float = 2.0) -> AsyncGenerator[MarketTick, None]:
         """
         Stream real-time price data for your ATR level tracking.
         Optimized for Schwab API rate limits (120 requests/minute).
         """
-        if not self.connected:
-            if not await self.connect():
-                return
+        if not await self._ensure_connected():
+            return
         
         self.active_symbols.update(symbols)
         logger.info(f"📊 Starting real-time stream for {symbols} (interval: {interval_seconds}s)")
         
         # Calculate safe interval based on Schwab rate limits
-        # 120 requests/minute = 2 requests/second max
-        safe_interval = max(interval_seconds, len(symbols) * 0.6)  # 0.6s per symbol minimum
+        # 120 requests/minute = 2 requests/second max; each cycle is one
+        # batched quote request however many symbols are streamed
+        safe_interval = max(interval_seconds, 0.5)
         
+        # Poll on a separate task so a slow consumer doesn't delay requests and
+        # a slow request doesn't stall ticks already fetched
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        poller = asyncio.create_task(self._poll_quotes(symbols, safe_interval, queue))
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            poller.cancel()
+    
+    async def _poll_quotes(self, symbols: List[str], interval: float, queue: asyncio.Queue):
+        """Producer for stream_real_time: fetch quotes every interval onto queue"""
         while True:
             try:
-                for symbol in symbols:
-                    tick = await self.get_current_price(symbol)
-                    if tick:
-                        yield tick
-                        
-                        # Log significant price movements for debugging
-                        if symbol == "SPX":
-                            await log_event("spx_tick", {
-                                "price": tick.price,
-                                "timestamp": tick.timestamp.isoformat()
-                            })
+                ticks = await self.get_multi_symbol_quotes(symbols)
+                for symbol, tick in ticks.items():
+                    # Blocks while the consumer is STREAM_QUEUE_SIZE ticks behind
+                    await queue.put(tick)
+                    
+                    # Log significant price movements for debugging; queued for
+                    # the batched event writer, and skipped unless DEBUG is on
+                    if symbol == "SPX" and logger.isEnabledFor(logging.DEBUG):
+                        log_event_nowait("spx_tick", {
+                            "price": tick.price,
+                            "timestamp": tick.timestamp.isoformat()
+                        })
                 
                 # Respect API rate limits
-                await asyncio.sleep(safe_interval)
+                await asyncio.sleep(interval)
                 
             except Exception as e:
                 logger.error(f"Error in real-time stream: {e}")
                 # Back off on errors
-                await asyncio.sleep(min(safe_interval * 2, 30.0))
+                await asyncio.sleep(min(interval * 2, 30.0))
     
     async def get_multi_symbol_quotes(self, symbols: List[str]) -> Dict[str, MarketTick]:
         """Get current quotes for multiple symbols in a single API call"""
-        if not self.connected:
-            if not await self.connect():
-                return {}
+        if not await self._ensure_connected():
+            return {}
         
         try:
             # Map symbols and create batch request
@@ -391,24 +641,15 @@ class SchwabDataCollector:
                 {"symbols": symbol_list}
             )
             
-            results = {}
-            for symbol, schwab_symbol in zip(symbols, schwab_symbols):
-                if schwab_symbol in response:
-                    quote = response[schwab_symbol]
-                    
-                    if quote.get("lastPrice", 0) > 0:
-                        results[symbol] = MarketTick(
-                            symbol=symbol,
-                            price=quote.get("lastPrice", 0.0),
-                            high=quote.get("highPrice", 0.0),
-                            low=quote.get("lowPrice", 0.0),
-                            volume=quote.get("totalVolume", 0),
-                            timestamp=datetime.now(timezone.utc),
-                            bid=quote.get("bidPrice"),
-                            ask=quote.get("askPrice")
-                        )
+            # One pass, one lookup per symbol; the whole batch shares a timestamp
+            now = datetime.now(timezone.utc)
+            results = {
+                symbol: tick
+                for symbol, schwab_symbol in zip(symbols, schwab_symbols)
+                if (data := response.get(schwab_symbol)) and (tick := self._parse_quote(symbol, data, now))
+            }
             
-            logger.info(f"✅ Retrieved quotes for {len(results)}/{len(symbols)} symbols")
+            logger.debug("✅ Retrieved quotes for %d/%d symbols", len(results), len(symbols))
             return results
             
         except Exception as e:
@@ -421,8 +662,13 @@ class SchwabDataCollector:
         if self.stats["api_requests"] > 0:
             success_rate = (self.stats["successful_requests"] / self.stats["api_requests"]) * 100
         
+        last_request_time = None
+        if self._last_request_ns is not None:
+            last_request_time = datetime.fromtimestamp(self._last_request_ns / 1e9).isoformat()
+        
         return {
             **self.stats,
+            "last_request_time": last_request_time,
             "success_rate_percent": round(success_rate, 2),
             "active_symbols": list(self.active_symbols),
             "symbol_mappings": self.symbol_map
@@ -432,37 +678,45 @@ class SchwabDataCollector:
         """Clean shutdown"""
         self.connected = False
         self.stats["connection_status"] = "disconnected"
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         logger.info("📡 Schwab Data Collector disconnected")
 
 # Global collector instance for module-level access
 _global_collector: Optional[SchwabDataCollector] = None
+_global_collector_lock = asyncio.Lock()
 
 async def get_data_collector(oauth_manager: Optional[SchwabOAuthManager] = None) -> SchwabDataCollector:
     """Get or create the global Schwab data collector instance"""
     global _global_collector
     
+    # Checked again under the lock: concurrent first callers wait for the one
+    # collector being built (and connected) instead of each creating their own
     if _global_collector is None:
-        if oauth_manager is None:
-            # Try to create oauth manager with default config
-            from schwab_config import get_schwab_config, SchwabOAuthManager
-            config = get_schwab_config()
-            
-            if config is None:
-                logger.error("❌ No Schwab configuration found!")
-                logger.error("   Set environment variables:")
-                logger.error("   - SCHWAB_CLIENT_ID")
-                logger.error("   - SCHWAB_CLIENT_SECRET") 
-                logger.error("   - SCHWAB_REDIRECT_URI (optional)")
-                raise Exception("Schwab configuration not found")
-            
-            oauth_manager = SchwabOAuthManager(
-                client_id=config.client_id,
-                client_secret=config.client_secret,
-                redirect_uri=config.redirect_uri
-            )
-        
-        _global_collector = SchwabDataCollector(oauth_manager)
-        await _global_collector.connect()
+        async with _global_collector_lock:
+            if _global_collector is None:
+                if oauth_manager is None:
+                    # Try to create oauth manager with default config
+                    from schwab_config import get_schwab_config, SchwabOAuthManager
+                    config = get_schwab_config()
+                    
+                    if config is None:
+                        logger.error("❌ No Schwab configuration found!")
+                        logger.error("   Set environment variables:")
+                        logger.error("   - SCHWAB_CLIENT_ID")
+                        logger.error("   - SCHWAB_CLIENT_SECRET") 
+                        logger.error("   - SCHWAB_REDIRECT_URI (optional)")
+                        raise Exception("Schwab configuration not found")
+                    
+                    oauth_manager = SchwabOAuthManager(
+                        client_id=config.client_id,
+                        client_secret=config.client_secret,
+                        redirect_uri=config.redirect_uri
+                    )
+                
+                _global_collector = SchwabDataCollector(oauth_manager)
+                await _global_collector.connect()
     
     return _global_collector
 
@@ -482,6 +736,14 @@ async def get_spx_daily_data(days: int = 30) -> List[OHLCCandle]:
     collector = await get_data_collector()
     return await collector.get_daily_data("SPX", days)
 
+async def get_spx_bundle(minute_days: int = 1, daily_days: int = 30) -> Tuple[List[OHLCCandle], List[OHLCCandle]]:
+    """Get SPX minute and daily data together - both requests run concurrently"""
+    collector = await get_data_collector()
+    return tuple(await asyncio.gather(
+        collector.get_minute_data("SPX", minute_days),
+        collector.get_daily_data("SPX", daily_days)
+    ))
+
 async def stream_spx_real_time() -> AsyncGenerator[MarketTick, None]:
     """Stream SPX real-time data for level tracking"""
     collector = await get_data_collector()
@@ -491,8 +753,7 @@ async def stream_spx_real_time() -> AsyncGenerator[MarketTick, None]:
 async def get_spx_snapshot() -> Dict[str, MarketTick]:
     """Get current SPX snapshot"""
     collector = await get_data_collector()
-    spx_tick = await collector.get_current_price("SPX")
-    return {"SPX": spx_tick} if spx_tick else {}
+    return await collector.get_multi_symbol_quotes(["SPX"])
 
 if __name__ == "__main__":
     # Test the Schwab data collector
@@ -505,12 +766,9 @@ if __name__ == "__main__":
             if spx_tick:
                 logger.info(f"✅ SPX Current: ${spx_tick.price:.2f} (High: ${spx_tick.high:.2f}, Low: ${spx_tick.low:.2f})")
             
-            # Test minute data
-            minute_candles = await get_spx_minute_data(1)
+            # Test minute and daily data (fetched concurrently)
+            minute_candles, daily_candles = await get_spx_bundle(1, 5)
             logger.info(f"✅ Retrieved {len(minute_candles)} minute candles")
-            
-            # Test daily data  
-            daily_candles = await get_spx_daily_data(5)
             logger.info(f"✅ Retrieved {len(daily_candles)} daily candles")
             
             # Test SPX snapshot
@@ -14,22 +14,52 @@ import aiohttp
 from database import log_event
 import json
 import logging
+import operator
 import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple, Union
 import websockets
+from websockets.asyncio.client import connect as ws_connect
 import pandas as pd
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+try:
+    import simdjson
+except ImportError:  # simdjson is optional - fall back to decoding whole frames
+    simdjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional - fall back to the default event loop
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
+# LEVELONE_EQUITIES fields read per tick: last, bid, ask, volume, high, low,
+# close, open, net change, net percent change and quote time
+_EQUITY_KEYS = ('3', '1', '2', '8', '10', '11', '12', '17', '18', '42', '34')
+_equity_values = operator.itemgetter(*_EQUITY_KEYS)
+
 class DataProviderType(Enum):
     SCHWAB = "schwab"
     PURE_STOCK_DATA = "pure_stock_data"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketData:
     symbol: str
     price: float
@@ -76,6 +106,8 @@ class SchwabStreamerProvider(BaseDataProvider):
         self.subscriptions = {}
         self.data_callbacks = {}
         self.heartbeat_callbacks = []
+        # simdjson parses frames lazily so only the fields we read are decoded
+        self._parser = simdjson.Parser() if simdjson is not None else None
         
         # Streamer endpoints (these would come from GET User Preference endpoint)
         self.streamer_url = "wss://streamer.schwab.com/streamer"
@@ -135,6 +167,9 @@ class SchwabStreamerProvider(BaseDataProvider):
             'post_market_net_change': '50',
             'post_market_percent_change': '51'
         }
+        
+        # Parser for each streamer service we subscribe to
+        self._service_parsers = {'LEVELONE_EQUITIES': self._parse_equity_data}
     
     def _get_next_request_id(self) -> str:
         self.request_id += 1
@@ -184,20 +219,26 @@ class SchwabStreamerProvider(BaseDataProvider):
             "parameters": {}
         }
     
-    async def connect(self) -> bool:
-        """Connect to Schwab Streamer WebSocket"""
+    async def send_batch(self, requests: List[Dict]):
+        """Send several streamer requests in a single frame"""
+        await self.websocket.send(_dumps({"requests": requests}))
+    
+    async def connect(self, subscriptions: Optional[List[Dict]] = None) -> bool:
+        """Connect to Schwab Streamer WebSocket, sending any subscription requests with the login"""
         try:
             logger.info("Connecting to Schwab Streamer...")
-            self.websocket = await websockets.connect(self.streamer_url)
+            # The asyncio client (websockets >= 14) is required for recv(decode=False).
+            # Quote frames are small and frequent - per-message compression costs more than it saves
+            self.websocket = await ws_connect(self.streamer_url, compression=None, max_size=2**22)
             self.connected = True
             
             # Send login request
             login_request = self._create_login_request()
-            await self.websocket.send(json.dumps({"requests": [login_request]}))
+            await self.send_batch([login_request, *(subscriptions or [])])
             
             # Wait for login response
-            response = await self.websocket.recv()
-            response_data = json.loads(response)
+            response = await self.websocket.recv(decode=False)
+            response_data = _loads(response)
             
             if 'response' in response_data:
                 for resp in response_data['response']:
@@ -221,7 +262,7 @@ class SchwabStreamerProvider(BaseDataProvider):
         if self.websocket and self.connected:
             try:
                 logout_request = self._create_logout_request()
-                await self.websocket.send(json.dumps({"requests": [logout_request]}))
+                await self.send_batch([logout_request])
                 await self.websocket.close()
             except Exception as e:
                 logger.error(f"Error disconnecting: {e}")
@@ -229,21 +270,30 @@ class SchwabStreamerProvider(BaseDataProvider):
                 self.connected = False
                 self.websocket = None
     
-    async def subscribe_to_symbols(self, symbols: List[str], callback: Callable[[MarketData], None] = None):
-        """Subscribe to real-time data for symbols"""
+    async def subscribe_to_symbols(self, symbols: Union[List[str], List[Tuple[str, List[str]]]],
+                                   callback: Callable[[MarketData], None] = None):
+        """Subscribe to real-time data for symbols
+        
+        symbols is either a list of equity symbols or a list of (service, symbols)
+        pairs; every subscription goes out in one frame, together with the login
+        when not yet connected.
+        """
+        services = [("LEVELONE_EQUITIES", symbols)] if symbols and isinstance(symbols[0], str) else symbols
+        sub_requests = [self._create_subscription_request(service, keys) for service, keys in services]
+        
+        # Store callback for each symbol
+        for _, keys in services:
+            for symbol in keys:
+                self.data_callbacks[symbol.upper()] = callback
+        
         if not self.connected:
-            if not await self.connect():
+            if not await self.connect(sub_requests):
                 return False
+            logger.info(f"Subscribed to symbols: {symbols}")
+            return True
         
         try:
-            # Subscribe to LEVELONE_EQUITIES
-            sub_request = self._create_subscription_request("LEVELONE_EQUITIES", symbols)
-            await self.websocket.send(json.dumps({"requests": [sub_request]}))
-            
-            # Store callback for each symbol
-            for symbol in symbols:
-                self.data_callbacks[symbol.upper()] = callback
-            
+            await self.send_batch(sub_requests)
             logger.info(f"Subscribed to symbols: {symbols}")
             return True
             
@@ -255,19 +305,24 @@ class SchwabStreamerProvider(BaseDataProvider):
         """Parse LEVELONE_EQUITIES data into MarketData object"""
         try:
             symbol = content.get('key', '')
-            last_price = content.get('3', 0)  # Last Price
-            bid_price = content.get('1', last_price)  # Bid Price
-            ask_price = content.get('2', last_price)  # Ask Price
-            volume = content.get('8', 0)  # Total Volume
-            high = content.get('10', last_price)  # High Price
-            low = content.get('11', last_price)  # Low Price
-            open_price = content.get('17', last_price)  # Open Price
-            close_price = content.get('12', last_price)  # Close Price
-            net_change = content.get('18', 0)  # Net Change
-            net_percent_change = content.get('42', 0)  # Net Percent Change
+            try:
+                (last_price, bid_price, ask_price, volume, high, low, close_price, open_price,
+                 net_change, net_percent_change, quote_time) = _equity_values(content)
+            except KeyError:
+                # Partial updates only carry the fields that changed
+                last_price = content.get('3', 0)  # Last Price
+                bid_price = content.get('1', last_price)  # Bid Price
+                ask_price = content.get('2', last_price)  # Ask Price
+                volume = content.get('8', 0)  # Total Volume
+                high = content.get('10', last_price)  # High Price
+                low = content.get('11', last_price)  # Low Price
+                open_price = content.get('17', last_price)  # Open Price
+                close_price = content.get('12', last_price)  # Close Price
+                net_change = content.get('18', 0)  # Net Change
+                net_percent_change = content.get('42', 0)  # Net Percent Change
+                quote_time = content.get('34', 0)  # Quote Time
             
             # Parse timestamp
-            quote_time = content.get('34', 0)  # Quote Time
             if quote_time:
                 timestamp = datetime.fromtimestamp(quote_time / 1000)
             else:
@@ -303,16 +358,9 @@ class SchwabStreamerProvider(BaseDataProvider):
             
             while self.connected:
                 try:
-                    message = await self.websocket.recv()
-                    data = json.loads(message)
-                    
-                    # Handle different message types
-                    if 'data' in data:
-                        await self._handle_data_message(data['data'])
-                    elif 'notify' in data:
-                        await self._handle_notify_message(data['notify'])
-                    elif 'response' in data:
-                        await self._handle_response_message(data['response'])
+                    # Keep text frames as bytes - the JSON parser validates UTF-8 itself
+                    message = await self.websocket.recv(decode=False)
+                    await self._handle_message(message)
                         
                 except websockets.exceptions.ConnectionClosed:
                     logger.warning("WebSocket connection closed")
@@ -325,19 +373,41 @@ class SchwabStreamerProvider(BaseDataProvider):
         finally:
             self.connected = False
     
+    def _parse_message(self, message):
+        """Parse a streamer frame, lazily when simdjson is available"""
+        if self._parser is None:
+            return _loads(message)
+        return self._parser.parse(message if isinstance(message, bytes) else message.encode())
+    
+    async def _handle_message(self, message):
+        """Dispatch one streamer frame by message type"""
+        # A simdjson document is only valid until the parser reads the next frame,
+        # so it must not outlive this call - callbacks only ever see MarketData
+        data = self._parse_message(message)
+        if 'data' in data:
+            await self._handle_data_message(data['data'])
+        elif 'notify' in data:
+            await self._handle_notify_message(data['notify'])
+        elif 'response' in data:
+            await self._handle_response_message(data['response'])
+    
     async def _handle_data_message(self, data_messages: List[Dict]):
         """Handle data messages from streamer"""
+        callbacks = self.data_callbacks
         for message in data_messages:
-            if message.get('service') == 'LEVELONE_EQUITIES':
-                for content in message.get('content', []):
-                    market_data = self._parse_equity_data(content)
-                    if market_data:
-                        symbol = market_data.symbol
-                        if symbol in self.data_callbacks and self.data_callbacks[symbol]:
-                            try:
-                                await self.data_callbacks[symbol](market_data)
-                            except Exception as e:
-                                logger.error(f"Error in data callback for {symbol}: {e}")
+            parser = self._service_parsers.get(message.get('service'))
+            if parser is None:
+                continue
+            for content in message.get('content', []):
+                market_data = parser(content)
+                if market_data:
+                    symbol = market_data.symbol
+                    callback = callbacks.get(symbol)
+                    if callback:
+                        try:
+                            await callback(market_data)
+                        except Exception as e:
+                            logger.error(f"Error in data callback for {symbol}: {e}")
     
     async def _handle_notify_message(self, notify_messages: List[Dict]):
         """Handle notify messages (heartbeats)"""
@@ -422,6 +492,14 @@ class DataProviderManager:
         else:
             raise ValueError(f"Unknown provider type: {provider_type}")
     
+    @staticmethod
+    def run(coro):
+        """Run a coroutine to completion, on a uvloop event loop when available"""
+        if uvloop is None:
+            return asyncio.run(coro)
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    
     async def get_quote(self, symbol: str) -> Optional[MarketData]:
         return await self.provider.get_quote(symbol)
     
@@ -434,7 +512,8 @@ class DataProviderManager:
     async def get_market_hours(self) -> Optional[Dict]:
         return await self.provider.get_market_hours()
     
-    async def subscribe_to_symbols(self, symbols: List[str], callback: Callable[[MarketData], None] = None):
+    async def subscribe_to_symbols(self, symbols: Union[List[str], List[Tuple[str, List[str]]]],
+                                   callback: Callable[[MarketData], None] = None):
         """Subscribe to real-time data (only works with Schwab Streamer)"""
         if isinstance(self.provider, SchwabStreamerProvider):
             return await self.provider.subscribe_to_symbols(symbols, callback)
@@ -482,4 +561,4 @@ if __name__ == "__main__":
         await data_provider.subscribe_to_symbols(["SPY"])
         await data_provider.start_streaming()
     
-    # asyncio.run(test_schwab()) 
\ No newline at end of file
+    # DataProviderManager.run(test_schwab()) 
\ No newline at end of file
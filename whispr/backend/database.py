@@ -1,8 +1,15 @@
 import aiosqlite
+import asyncio
+import contextlib
+import itertools
 import json
+import logging
+import operator
 import os
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 DB_PATH = Path(os.getenv("DB_PATH", "./data/whispr.db"))
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # /app/data
 
@@ -30,9 +37,232 @@ async def get_db():
         await get_db.conn.executescript(CREATE_SQL)
     return get_db.conn
 
+async def reset_db():
+    """Drop the singleton connection so the next get_db() opens a fresh one."""
+    conn = getattr(get_db, "conn", None)
+    if conn is None:
+        return
+    del get_db.conn
+    with contextlib.suppress(Exception):  # it is usually already dead
+        await conn.close()
+
+# Read-only connections: WAL lets them run alongside the single writer
+READ_POOL_SIZE = 4
+READ_BATCH_SIZE = 256
+READ_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-64000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA query_only=ON;
+"""
+_read_pool = None
+
+class ReadPool:
+    """A few primed read-only connections; all writes stay on get_db().
+
+    Defaults to the app database; pass path/pragmas/row_factory to pool
+    another SQLite file.
+    """
+
+    def __init__(self, size: int = READ_POOL_SIZE, path=None, pragmas: str = READ_PRAGMAS,
+                 row_factory=aiosqlite.Row):
+        self.size = size
+        self.path = path
+        self.pragmas = pragmas
+        self.row_factory = row_factory
+        self._conns = []
+        self._opening = 0
+        self._idle = asyncio.Queue()
+        self._generation = 0  # bumped by close(); older borrowed connections are closed on return
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        """Borrow a connection, opening a new one while under the pool size."""
+        if self._idle.empty() and len(self._conns) + self._opening < self.size:
+            generation = self._generation
+            self._opening += 1
+            try:
+                conn = await aiosqlite.connect(self.path or DB_PATH, isolation_level=None)
+                try:
+                    await conn.executescript(self.pragmas)
+                except BaseException:
+                    await conn.close()
+                    raise
+                conn.row_factory = self.row_factory  # Row: index or name access, no per-row dict
+            finally:
+                self._opening -= 1
+            if generation == self._generation:
+                self._conns.append(conn)
+        else:
+            conn = await self._idle.get()
+            generation = self._generation
+        try:
+            yield conn
+        finally:
+            if generation == self._generation:
+                self._idle.put_nowait(conn)
+            else:
+                # The pool was closed while this connection was borrowed
+                with contextlib.suppress(Exception):
+                    await conn.close()
+
+    async def close(self):
+        """Close idle connections now and borrowed ones as they are returned."""
+        self._generation += 1
+        self._conns.clear()
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            with contextlib.suppress(Exception):
+                await conn.close()
+
+def get_read_pool() -> ReadPool:
+    """Return the process-wide read pool."""
+    global _read_pool
+    if _read_pool is None:
+        _read_pool = ReadPool()
+    return _read_pool
+
+async def close_read_pool():
+    global _read_pool
+    if _read_pool is not None:
+        await _read_pool.close()
+        _read_pool = None
+
+async def read_fetchall(sql: str, params=()):
+    """Run a read-only query on a pooled connection."""
+    async with get_read_pool().acquire() as conn:
+        return await conn.execute_fetchall(sql, params)
+
+async def read_iter(sql: str, params=(), batch_size: int = READ_BATCH_SIZE):
+    """Stream rows of a read-only query, fetching batch_size rows at a time.
+
+    The pooled connection is held until the iteration finishes.
+    """
+    async with get_read_pool().acquire() as conn:
+        async with conn.execute(sql, params) as cursor:
+            cursor.arraysize = batch_size
+            async for row in cursor:
+                yield row
+
+# Explicit transactions on the shared connection must not interleave, and
+# autocommit writes must not land inside another coroutine's open transaction
+_transaction_lock = asyncio.Lock()
+_transaction_owner = None
+
+@contextlib.asynccontextmanager
+async def write_lock():
+    """Hold the shared connection between transactions for a standalone write.
+
+    Inside the current task's own transaction() the lock is already held.
+    """
+    if _transaction_owner is not None and _transaction_owner is asyncio.current_task():
+        yield
+        return
+    async with _transaction_lock:
+        yield
+
+@contextlib.asynccontextmanager
+async def transaction(mode: str = ""):
+    """Run statements on the shared connection inside one BEGIN ... COMMIT."""
+    global _transaction_owner
+    async with _transaction_lock:
+        _transaction_owner = asyncio.current_task()
+        try:
+            conn = await get_db()
+            await conn.execute(f"BEGIN {mode}")
+            try:
+                yield conn
+            except BaseException:
+                await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+        finally:
+            _transaction_owner = None
+
+INSERT_EVENT_SQL = "INSERT INTO events (ts, event_type, payload) VALUES (datetime('now'), ?, ?)"
+
+# Background write-combiner used by execute_nowait
+WRITE_BATCH_SIZE = 64
+_write_queue = None
+_writer = None
+
+# Background event writer used by log_event_nowait
+EVENT_BATCH_SIZE = 256
+EVENT_FLUSH_INTERVAL = 0.05  # seconds to let events coalesce before a write
+_event_queue = None
+_event_writer = None
+
 async def log_event(event_type: str, payload: dict):
     conn = await get_db()
-    await conn.execute(
-        "INSERT INTO events (ts, event_type, payload) VALUES (datetime('now'), ?, ?)",
-        (event_type, json.dumps(payload)),
-    )
+    async with write_lock():
+        await conn.execute(INSERT_EVENT_SQL, (event_type, json.dumps(payload)))
+
+async def log_events(events):
+    """Write many (event_type, payload) pairs with a single executemany."""
+    rows = [(event_type, json.dumps(payload)) for event_type, payload in events]
+    if rows:
+        conn = await get_db()
+        async with write_lock():
+            await conn.executemany(INSERT_EVENT_SQL, rows)
+
+def log_event_nowait(event_type: str, payload: dict):
+    """Queue an event for the background writer instead of awaiting the insert."""
+    global _event_queue, _event_writer
+    if _event_writer is None or _event_writer.done():
+        _event_queue = asyncio.Queue()
+        _event_writer = asyncio.get_running_loop().create_task(_drain_events(_event_queue))
+    _event_queue.put_nowait((event_type, json.dumps(payload)))
+
+async def flush_events():
+    """Wait until every queued event has been written."""
+    if _event_queue is not None and _event_writer is not None and not _event_writer.done():
+        await _event_queue.join()
+
+async def _drain_events(queue: asyncio.Queue):
+    """Single writer: batch queued events into one executemany per flush."""
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(EVENT_FLUSH_INTERVAL)
+        while len(batch) < EVENT_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            conn = await get_db()
+            async with write_lock():
+                await conn.executemany(INSERT_EVENT_SQL, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} queued events: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+def execute_nowait(sql: str, params: tuple):
+    """Queue a write statement for the background writer instead of awaiting it."""
+    global _write_queue, _writer
+    if _writer is None or _writer.done():
+        _write_queue = asyncio.Queue()
+        _writer = asyncio.get_running_loop().create_task(_drain_writes(_write_queue))
+    _write_queue.put_nowait((sql, params))
+
+async def flush_writes():
+    """Wait until every queued write has been applied."""
+    if _write_queue is not None and _writer is not None and not _writer.done():
+        await _write_queue.join()
+
+async def _drain_writes(queue: asyncio.Queue):
+    """Single writer: apply queued writes in one transaction per batch."""
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            async with transaction() as conn:
+                # Consecutive writes of the same statement share one executemany
+                for sql, group in itertools.groupby(batch, key=operator.itemgetter(0)):
+                    await conn.executemany(sql, [params for _, params in group])
+        except Exception as e:
+            logger.error(f"Failed to apply {len(batch)} queued writes: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
@@ -69,6 +69,12 @@ class HistoricalDataBackfill:
             ON historical_candles(symbol, timeframe, timestamp)
         """)
         
+        # Bootstrap queries filter on timeframe only and order by timestamp
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_historical_timeframe_time 
+            ON historical_candles(timeframe, timestamp)
+        """)
+        
         conn.commit()
         conn.close()
         print("✅ Historical data tables created")
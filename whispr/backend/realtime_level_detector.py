@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 import json
 import os
 
+import numpy as np
+
 from comprehensive_level_detector import ComprehensiveLevelCalculator, ATRLevel
 
 logging.basicConfig(level=logging.INFO)
@@ -47,20 +49,26 @@ class RealtimeLevelHitDetector:
             """, (self.session_date,))
 
             rows = await cursor.fetchall()
+            loaded = []
             for row in rows:
                 timeframe, atr_value, previous_close = row
                 self.current_atr_data[timeframe] = {
                     'atr': atr_value,
                     'pdc': previous_close
                 }
-
-                # Calculate all 28 levels for this timeframe
                 if atr_value and previous_close:
-                    levels = self.calculator.calculate_all_levels(
-                        pdc=previous_close,
-                        atr_value=atr_value,
-                        timeframe=timeframe
-                    )
+                    loaded.append(row)
+
+            # Calculate all 28 levels for every timeframe in one batch
+            if loaded:
+                timeframes, atrs, pdcs = zip(*loaded)
+                all_levels = self.calculator.calculate_all_levels_batch(
+                    pdcs=np.array(pdcs, dtype=np.float64),
+                    atrs=np.array(atrs, dtype=np.float64),
+                    timeframes=list(timeframes)
+                )
+                for timeframe, atr_value, previous_close in loaded:
+                    levels = all_levels[timeframe]
                     logger.info(f"📊 Loaded {len(levels)} levels for {timeframe}: PDC=${previous_close:.2f}, ATR=${atr_value:.2f}")
 
         except Exception as e:
@@ -274,8 +282,8 @@ async def main():
         for tf, data in analysis['timeframes'].items():
             print(f"\n{tf}:")
             print(f"  Zone: {data['current_zone']}")
-            print(f"  ATR Multiple: {data['atr_multiple']}")
-            print(f"  % from PDC: {data['percentage_from_pdc']}%")
+            print(f"  ATR Multiple: {data['atr_multiple']:.3f}")
+            print(f"  % from PDC: {data['percentage_from_pdc']:.2f}%")
             if data['nearest_above']:
                 print(f"  Next Level Up: {data['nearest_above'][0]['name']} @ ${data['nearest_above'][0]['value']:.2f} (${data['nearest_above'][0]['distance']:.2f} away)")
             if data['nearest_below']:
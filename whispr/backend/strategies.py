@@ -3,7 +3,7 @@ import ast
 import operator as op
 from database import get_db, log_event, log_strategy_trigger
 from indicators import indicator_manager, gg_rule_generator
-from atr_strategy import atr_strategy_generator
+from atr_strategy import get_atr_strategy_generator
 from vomy_strategy import VomyStrategyGenerator, VomyStrategyEvaluator
 from four_h_po_dot_strategy import po_dot_strategy_generator
 from conviction_arrow_strategy import conviction_arrow_strategy
@@ -86,11 +86,15 @@ async def check_strategies(tick):
                 }
         elif strategy_type == "atr_based":
             # Handle ATR-based strategies
-            result = await atr_strategy_generator.evaluate_atr_strategy(
-                strategy["id"],
-                tick.get("price", tick.get("value", 0)),
-                tick.get("symbol", "SPY")
-            )
+            atr_strategy_generator = get_atr_strategy_generator()
+            if atr_strategy_generator is None:
+                result = {"triggered": False, "error": "ATR configuration not found"}
+            else:
+                result = await atr_strategy_generator.evaluate_atr_strategy(
+                    strategy["id"],
+                    tick.get("price", tick.get("value", 0)),
+                    tick.get("symbol", "SPY")
+                )
             if result.get("triggered", False):
                 triggered_strategy = {
                     **strategy,
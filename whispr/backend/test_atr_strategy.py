@@ -6,7 +6,9 @@ Test script for ATR strategy generation and evaluation.
 import asyncio
 import json
 from database import get_db, log_event
-from atr_strategy import atr_strategy_generator
+from atr_strategy import get_atr_strategy_generator
+
+atr_strategy_generator = get_atr_strategy_generator()
 
 async def test_atr_strategy_system():
     """Test the complete ATR strategy system."""
@@ -7,11 +7,39 @@ Fixes the core aggregation problem in the current system.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import asyncio
 
+# Row layout of a ``historical_candles`` SELECT: timestamp, open, high, low, close, volume
+CANDLE_ROW_DTYPE = np.dtype([
+    ('ts', 'U32'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('v', 'i8')
+])
+
+
+# Same row with the timestamp already converted by SQLite to Unix epoch seconds,
+# i.e. selected as CAST(strftime('%s', timestamp) AS INTEGER)
+CANDLE_EPOCH_ROW_DTYPE = np.dtype([
+    ('ts', 'i8'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('v', 'i8')
+])
+
+# Column layout of a bootstrapped timeframe cache (one structured array per timeframe)
+BAR_DTYPE = np.dtype([
+    ('ts', 'datetime64[us]'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('v', 'i8')
+])
+
+
+def to_utc_datetime64(timestamps) -> np.ndarray:
+    """
+    Parse ISO-8601 UTC timestamp strings into a naive (UTC) datetime64[us] array.
+    Strips the 'Z' / '+00:00' suffix so NumPy's C parser can handle the whole column.
+    """
+    stamps = np.asarray(timestamps, dtype=str)
+    stamps = np.char.replace(np.char.replace(stamps, '+00:00', ''), 'Z', '')
+    return stamps.astype('datetime64[us]')
+
+
 @dataclass
 class OHLCBar:
     """Represents a single OHLC bar"""
@@ -48,7 +76,8 @@ class SPXTimeframeAggregator:
         }
         
         # Cache for aggregated data to avoid recalculation
-        self.aggregated_cache: Dict[str, List[OHLCBar]] = {
+        # Bootstrapped timeframes hold a BAR_DTYPE array; bars are built on read
+        self.aggregated_cache: Dict[str, Union[List[OHLCBar], np.ndarray]] = {
             tf: [] for tf in self.timeframe_mapping.keys()
         }
         
@@ -74,6 +103,33 @@ class SPXTimeframeAggregator:
         if len(self.minute_data_buffer) > self.buffer_size:
             self.minute_data_buffer = self.minute_data_buffer[-self.buffer_size:]
     
+    def add_bars_bulk(self, timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray,
+                      lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray,
+                      timeframe: str = "1m"):
+        """
+        Add many OHLC bars at once from column arrays (e.g. a database bootstrap).
+        Minute bars go into the aggregation buffer; any other timeframe replaces
+        that timeframe's cache directly with a BAR_DTYPE array.
+        
+        Args:
+            timestamps: datetime64 array in UTC (see to_utc_datetime64)
+        """
+        bars = np.empty(len(timestamps), dtype=BAR_DTYPE)
+        bars['ts'] = timestamps
+        bars['o'] = opens
+        bars['h'] = highs
+        bars['l'] = lows
+        bars['c'] = closes
+        bars['v'] = volumes
+        
+        if timeframe != "1m":
+            self.aggregated_cache[timeframe] = bars
+            return
+        
+        self.minute_data_buffer.extend(self._array_to_bars(bars, timeframe))
+        if len(self.minute_data_buffer) > self.buffer_size:
+            self.minute_data_buffer = self.minute_data_buffer[-self.buffer_size:]
+    
     def add_tick_data(self, timestamp: datetime, price: float, high: float = None, 
                      low: float = None, volume: int = 1000):
         """
@@ -133,9 +189,12 @@ class SPXTimeframeAggregator:
             periods: Number of recent bars to return
         """
         # First check if we have cached data (from database bootstrap)
-        if timeframe in self.aggregated_cache and self.aggregated_cache[timeframe]:
-            cached_data = self.aggregated_cache[timeframe]
-            return cached_data[-periods:] if len(cached_data) >= periods else cached_data
+        cached_data = self.aggregated_cache.get(timeframe)
+        if cached_data is not None and len(cached_data):
+            recent = cached_data[-periods:]
+            if isinstance(recent, np.ndarray):
+                return self._array_to_bars(recent, timeframe)
+            return recent
         
         # Fallback to aggregated data (from live minute data)
         aggregated = self.get_aggregated_timeframes()
@@ -145,6 +204,18 @@ class SPXTimeframeAggregator:
         
         return []
     
+    @staticmethod
+    def _array_to_bars(bars: np.ndarray, timeframe: str) -> List[OHLCBar]:
+        """Materialize OHLCBar objects from a BAR_DTYPE array"""
+        stamps = pd.DatetimeIndex(bars['ts'], tz='UTC').to_pydatetime()
+        return [
+            OHLCBar(ts, o, h, l, c, v, timeframe)
+            for ts, o, h, l, c, v in zip(
+                stamps, bars['o'].tolist(), bars['h'].tolist(), bars['l'].tolist(),
+                bars['c'].tolist(), bars['v'].tolist()
+            )
+        ]
+    
     def _buffer_to_dataframe(self) -> pd.DataFrame:
         """Convert minute buffer to pandas DataFrame with proper index"""
         data = {
@@ -128,7 +128,7 @@ class ComprehensiveAnalyticsDashboard:
         }
 
         for level_name, level in levels.items():
-            if 'beyond' in level_name:
+            if level_name in ComprehensiveLevelCalculator.BEYOND_LEVELS:
                 continue
 
             color = colors.get(level.direction, '#6b7280')